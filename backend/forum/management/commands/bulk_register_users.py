@@ -0,0 +1,17 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from forum.serializers import bulk_register
+
+
+class Command(BaseCommand):
+    help = 'Register users from a CSV file with username, email and password columns'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help='Path to the CSV file; its first row names the columns')
+
+    def handle(self, *args, **options):
+        with open(options['csv_file'], newline='') as f:
+            users = bulk_register(list(csv.DictReader(f)))
+        self.stdout.write(self.style.SUCCESS(f'Registered {len(users)} users'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from forum.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Recompute every user\'s reputation tier (run nightly, e.g. from cron)'
+
+    def handle(self, *args, **options):
+        updated = UserProfile.recompute_all_tiers()
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} profiles'))
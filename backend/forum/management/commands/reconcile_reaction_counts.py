@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from forum.models import Post, Comment, Reaction
+
+
+class Command(BaseCommand):
+    help = 'Correct drifted post/comment reactions_count values (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **options):
+        posts = Post.recount('reactions_count', Reaction, 'post')
+        comments = Comment.recount('reactions_count', Reaction, 'comment')
+        self.stdout.write(self.style.SUCCESS(f'Fixed {posts} posts and {comments} comments'))
@@ -1,4 +1,9 @@
-from django.db import migrations
+from django.db import migrations, transaction
+
+
+DEFAULT_TOPICS = [
+    ('General', 'General discussion'),
+]
 
 
 def create_default_topics(apps, schema_editor):
@@ -11,16 +16,18 @@ def create_default_topics(apps, schema_editor):
         defaults={'email': 'gmbos@iscte-iul.pt'}
     )
     
-    Topic.objects.create(
-        name='General',
-        description='General discussion',
-        creator=system_user
-    )
+    # One multi-row INSERT; topics that already exist are skipped
+    topics = [
+        Topic(name=name, description=description, creator=system_user)
+        for name, description in DEFAULT_TOPICS
+    ]
+    with transaction.atomic():
+        Topic.objects.bulk_create(topics, batch_size=1000, ignore_conflicts=True)
 
 
 def remove_default_topics(apps, schema_editor):
     Topic = apps.get_model('forum', 'Topic')
-    Topic.objects.filter(name='General').delete()
+    Topic.objects.filter(name__in=[name for name, _ in DEFAULT_TOPICS]).delete()
 
 
 class Migration(migrations.Migration):
@@ -0,0 +1,39 @@
+# Generated by Django 6.0 on 2026-10-15 21:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0002_auto_20251209_2323'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flag',
+            index=models.Index(fields=['status', 'created_at'], name='flag_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flag',
+            index=models.Index(condition=models.Q(('post__isnull', False)), fields=['post', 'status'], name='flag_post_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(condition=models.Q(('post__isnull', False)), fields=['user', 'post'], name='like_user_post_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(condition=models.Q(('comment__isnull', False)), fields=['user', 'comment'], name='like_user_comment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(condition=models.Q(('post__isnull', False)), fields=['post', 'created_at'], name='like_post_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reaction',
+            index=models.Index(condition=models.Q(('post__isnull', False)), fields=['post', 'emoji'], name='reaction_post_emoji_idx'),
+        ),
+    ]
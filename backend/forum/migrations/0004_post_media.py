@@ -0,0 +1,79 @@
+# Generated by Django 6.0 on 2026-10-15 21:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+MEDIA_FIELDS = {
+    'images': 'image',
+    'videos': 'video',
+    'gifs': 'gif',
+    'links': 'link',
+}
+
+
+def copy_media_to_rows(apps, schema_editor):
+    Post = apps.get_model('forum', 'Post')
+    PostMedia = apps.get_model('forum', 'PostMedia')
+    
+    rows = []
+    for post in Post.objects.only('id', *MEDIA_FIELDS).iterator():
+        for field, kind in MEDIA_FIELDS.items():
+            for order, url in enumerate(getattr(post, field) or []):
+                rows.append(PostMedia(post_id=post.id, kind=kind, url=url, order=order))
+    PostMedia.objects.bulk_create(rows, batch_size=1000)
+
+
+def copy_media_to_json(apps, schema_editor):
+    Post = apps.get_model('forum', 'Post')
+    PostMedia = apps.get_model('forum', 'PostMedia')
+    kind_fields = {kind: field for field, kind in MEDIA_FIELDS.items()}
+    
+    posts = {}
+    for media in PostMedia.objects.order_by('post_id', 'kind', 'order').iterator():
+        post = posts.get(media.post_id)
+        if post is None:
+            post = posts[media.post_id] = Post(id=media.post_id, images=[], videos=[], gifs=[], links=[])
+        getattr(post, kind_fields[media.kind]).append(media.url)
+    Post.objects.bulk_update(posts.values(), list(MEDIA_FIELDS), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0003_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostMedia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('image', 'Image'), ('video', 'Video'), ('gif', 'GIF'), ('link', 'Link')], max_length=10)),
+                ('url', models.URLField(max_length=500)),
+                ('order', models.IntegerField(default=0)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='media', to='forum.post')),
+            ],
+            options={
+                'ordering': ['order'],
+                'indexes': [models.Index(fields=['post', 'kind'], name='postmedia_post_kind_idx')],
+            },
+        ),
+        migrations.RunPython(copy_media_to_rows, reverse_code=copy_media_to_json),
+        migrations.RemoveField(
+            model_name='post',
+            name='gifs',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='images',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='links',
+        ),
+        migrations.RemoveField(
+            model_name='post',
+            name='videos',
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 6.0 on 2026-10-15 21:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicates(apps, schema_editor):
+    """NULLs never collided under unique_together, so races could leave duplicates"""
+    for model_name, fields in [
+        ('Like', ['user', 'content_type', 'post', 'comment']),
+        ('Reaction', ['user', 'content_type', 'post', 'comment', 'emoji']),
+    ]:
+        Model = apps.get_model('forum', model_name)
+        duplicates = Model.objects.values(*fields).annotate(
+            keep_id=models.Min('id'), rows=models.Count('id')
+        ).filter(rows__gt=1)
+        for group in duplicates:
+            keep_id = group.pop('keep_id')
+            group.pop('rows')
+            Model.objects.filter(**group).exclude(id=keep_id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0004_post_media'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='like',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='reaction',
+            unique_together=set(),
+        ),
+        migrations.RunPython(remove_duplicates, reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('content_type', 'post')), fields=('user', 'post'), name='uniq_like_user_post'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('content_type', 'comment')), fields=('user', 'comment'), name='uniq_like_user_comment'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('content_type', 'post')), fields=('user', 'post', 'emoji'), name='uniq_reaction_user_post'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('content_type', 'comment')), fields=('user', 'comment', 'emoji'), name='uniq_reaction_user_comment'),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 6.0 on 2026-10-15 21:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+TARGETED_MODELS = ['Like', 'Reaction', 'FactCheckNote']
+
+
+def resolve_single_target(apps, schema_editor):
+    """Make every row point at exactly one of post/comment, trusting content_type"""
+    for model_name in TARGETED_MODELS:
+        Model = apps.get_model('forum', model_name)
+        Model.objects.filter(post__isnull=True, comment__isnull=True).delete()
+        both = Model.objects.filter(post__isnull=False, comment__isnull=False)
+        both.filter(content_type='post').update(comment=None)
+        both.filter(content_type='comment').update(post=None)
+        both.update(comment=None)
+
+
+def restore_content_type(apps, schema_editor):
+    for model_name in TARGETED_MODELS:
+        Model = apps.get_model('forum', model_name)
+        Model.objects.filter(post__isnull=False).update(content_type='post')
+        Model.objects.filter(post__isnull=True).update(content_type='comment')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0005_partial_unique_likes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='like',
+            name='uniq_like_user_post',
+        ),
+        migrations.RemoveConstraint(
+            model_name='like',
+            name='uniq_like_user_comment',
+        ),
+        migrations.RemoveConstraint(
+            model_name='reaction',
+            name='uniq_reaction_user_post',
+        ),
+        migrations.RemoveConstraint(
+            model_name='reaction',
+            name='uniq_reaction_user_comment',
+        ),
+        migrations.RunPython(resolve_single_target, reverse_code=restore_content_type),
+        # Defaults let the reverse migration re-add the columns before restore_content_type fills them
+        migrations.AlterField(
+            model_name='factchecknote',
+            name='content_type',
+            field=models.CharField(choices=[('post', 'Post'), ('comment', 'Comment')], default='post', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='like',
+            name='content_type',
+            field=models.CharField(choices=[('post', 'Post'), ('comment', 'Comment')], default='post', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='reaction',
+            name='content_type',
+            field=models.CharField(choices=[('post', 'Post'), ('comment', 'Comment')], default='post', max_length=20),
+        ),
+        migrations.RemoveField(
+            model_name='factchecknote',
+            name='content_type',
+        ),
+        migrations.RemoveField(
+            model_name='like',
+            name='content_type',
+        ),
+        migrations.RemoveField(
+            model_name='reaction',
+            name='content_type',
+        ),
+        migrations.AddConstraint(
+            model_name='factchecknote',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('comment__isnull', True), ('post__isnull', False)), models.Q(('comment__isnull', False), ('post__isnull', True)), _connector='OR'), name='factchecknote_single_target'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', False)), fields=('user', 'post'), name='uniq_like_user_post'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.UniqueConstraint(condition=models.Q(('comment__isnull', False)), fields=('user', 'comment'), name='uniq_like_user_comment'),
+        ),
+        migrations.AddConstraint(
+            model_name='like',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('comment__isnull', True), ('post__isnull', False)), models.Q(('comment__isnull', False), ('post__isnull', True)), _connector='OR'), name='like_single_target'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('post__isnull', False)), fields=('user', 'post', 'emoji'), name='uniq_reaction_user_post'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('comment__isnull', False)), fields=('user', 'comment', 'emoji'), name='uniq_reaction_user_comment'),
+        ),
+        migrations.AddConstraint(
+            model_name='reaction',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('comment__isnull', True), ('post__isnull', False)), models.Q(('comment__isnull', False), ('post__isnull', True)), _connector='OR'), name='reaction_single_target'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-15 21:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0006_drop_content_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_hidden', False)), fields=['-created_at'], name='post_visible_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_hidden', False)), fields=['topic', '-created_at'], name='post_topic_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-15 21:20
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_ends_at(apps, schema_editor):
+    Poll = apps.get_model('forum', 'Poll')
+    polls = list(Poll.objects.only('id', 'created_at', 'duration_hours'))
+    for poll in polls:
+        poll.ends_at = poll.created_at + timezone.timedelta(hours=poll.duration_hours)
+    Poll.objects.bulk_update(polls, ['ends_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0007_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='poll',
+            name='ends_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(fill_ends_at, reverse_code=migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='poll',
+            name='ends_at',
+            field=models.DateTimeField(),
+        ),
+        migrations.AddIndex(
+            model_name='poll',
+            index=models.Index(condition=models.Q(('ended_at__isnull', True)), fields=['ends_at'], name='poll_open_ends_at_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-15 21:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def count_existing_reactions(apps, schema_editor):
+    Post = apps.get_model('forum', 'Post')
+    Reaction = apps.get_model('forum', 'Reaction')
+    
+    reacted = Reaction.objects.filter(post__isnull=False).values('post_id').annotate(
+        total=models.Count('id')
+    ).values_list('post_id', 'total')
+    posts = [Post(id=post_id, reactions_count=total) for post_id, total in reacted]
+    Post.objects.bulk_update(posts, ['reactions_count'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0008_poll_ends_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='reactions_count',
+            field=models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)]),
+        ),
+        migrations.RunPython(count_existing_reactions, migrations.RunPython.noop),
+    ]
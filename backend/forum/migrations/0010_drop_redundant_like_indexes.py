@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-15 21:35
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0009_post_reactions_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='like',
+            name='like_user_post_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='like',
+            name='like_user_comment_idx',
+        ),
+    ]
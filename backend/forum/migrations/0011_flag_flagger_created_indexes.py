@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-15 21:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forum', '0010_drop_redundant_like_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='flag',
+            name='flagger',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='flags_created', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='flag',
+            name='identified_flagger',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='identified_flags', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='flag',
+            index=models.Index(fields=['flagger', '-created_at'], name='flag_flagger_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flag',
+            index=models.Index(fields=['identified_flagger', '-created_at'], name='flag_identified_created_idx'),
+        ),
+    ]
@@ -1,8 +1,54 @@
-from django.db import models
+from functools import lru_cache
+
+from django.db import models, connection
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
 from django.utils import timezone
 
+# ============================================================================
+# COUNTERS
+# ============================================================================
+
+def shifted(field, delta):
+    """`field + delta` as a database expression, floored at zero for decrements"""
+    value = models.F(field) + delta
+    if delta < 0:
+        value = Greatest(value, 0)
+    return value
+
+
+class CounterMixin:
+    """Atomic updates for denormalized *_count columns"""
+
+    def bump(self, field, delta=1):
+        """Add `delta` to a counter with a single UPDATE, never going below zero"""
+        type(self)._default_manager.filter(pk=self.pk).update(**{field: shifted(field, delta)})
+
+    @classmethod
+    def bump_rows(cls, key, changes):
+        """Apply (key value, field, delta) changes across several rows in one UPDATE"""
+        whens = {}
+        for value, field, delta in changes:
+            whens.setdefault(field, []).append(
+                models.When(**{key: value}, then=shifted(field, delta))
+            )
+        cls._default_manager.filter(**{f'{key}__in': {value for value, _, _ in changes}}).update(**{
+            field: models.Case(*field_whens, default=models.F(field))
+            for field, field_whens in whens.items()
+        })
+
+    @classmethod
+    def recount(cls, field, related_model, related_field):
+        """Reset drifted counters to the real related row count; returns the rows fixed"""
+        actual = Coalesce(models.Subquery(
+            related_model.objects.filter(**{related_field: models.OuterRef('pk')})
+            .order_by().values(related_field)
+            .annotate(total=models.Count('pk')).values('total')
+        ), 0)
+        return cls._default_manager.exclude(**{field: actual}).update(**{field: actual})
+
+
 # ============================================================================
 # USER PROFILE & REPUTATION SYSTEM
 # ============================================================================
@@ -21,6 +67,22 @@ class ReputationTier(models.Model):
         return f"Tier {self.tier_number} ({self.description})"
 
 
+# Cached /api/reputation-tiers/ response body; deleted by the ReputationTier signals
+TIER_LIST_CACHE_KEY = 'forum:reputation-tiers'
+
+# Version stamp in the keys of cached fact-check note lists; bumped by the
+# FactCheckNote/FactCheckVote signals so every cached page expires at once
+FACT_CHECK_LIST_VERSION_KEY = 'forum:fact-check-notes:version'
+
+
+@lru_cache(maxsize=None)
+def get_tier_bands():
+    """(min_points, tier_id) pairs, highest tier first; cleared by ReputationTier signals"""
+    return list(
+        ReputationTier.objects.order_by('-tier_number').values_list('min_points', 'pk')
+    )
+
+
 def get_default_reputation_tier_pk():
 # Tier 0 as default, for example
     tier, _ = ReputationTier.objects.get_or_create(
@@ -33,7 +95,7 @@ def get_default_reputation_tier_pk():
     )
     return tier.pk
 
-class UserProfile(models.Model):
+class UserProfile(CounterMixin, models.Model):
     """Extended user profile with community features"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     
@@ -76,14 +138,27 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username}'s Profile (Tier {self.reputation_tier.tier_number if self.reputation_tier else 0})"
 
-    def update_reputation_tier(self):
-        """Update user's tier based on reputation points"""
-        tier = ReputationTier.objects.filter(
-            min_points__lte=self.reputation_points
-        ).order_by('-tier_number').first()
-        if tier:
-            self.reputation_tier = tier
-            self.save(update_fields=['reputation_tier'])
+    @classmethod
+    def retier(cls, **filters):
+        """Move the matching profiles into their tier with one UPDATE built from
+        the cached bands; rows already in the right tier are not written"""
+        bands = get_tier_bands()
+        if not bands:
+            return 0
+        tier = models.Case(
+            *[models.When(reputation_points__gte=min_points, then=models.Value(tier_id))
+              for min_points, tier_id in bands],
+            default=models.F('reputation_tier_id'),
+            output_field=models.BigIntegerField(),
+        )
+        return cls.objects.filter(**filters).exclude(reputation_tier_id=tier).update(
+            reputation_tier_id=tier
+        )
+
+    @classmethod
+    def recompute_all_tiers(cls):
+        """Re-tier every profile; returns the number of profiles that changed tier"""
+        return cls.retier()
 
 
 class UserFollowing(models.Model):
@@ -103,7 +178,7 @@ class UserFollowing(models.Model):
 # TOPICS & MODERATION
 # ============================================================================
 
-class Topic(models.Model):
+class Topic(CounterMixin, models.Model):
     """Discussion topics created by users"""
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='topics_created')
     name = models.CharField(max_length=200, unique=True)
@@ -202,7 +277,7 @@ class BanAppeal(models.Model):
 # POSTS & COMMENTS
 # ============================================================================
 
-class Post(models.Model):
+class Post(CounterMixin, models.Model):
     """Posts made under a topic"""
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name='posts')
@@ -210,15 +285,12 @@ class Post(models.Model):
     title = models.CharField(max_length=300)
     content = models.TextField()
     
-    # Media & links
-    images = models.JSONField(default=list, blank=True)  # List of image URLs
-    videos = models.JSONField(default=list, blank=True)  # List of video URLs
-    gifs = models.JSONField(default=list, blank=True)    # List of GIF URLs
-    links = models.JSONField(default=list, blank=True)   # List of external links
+    # Media & links are stored as PostMedia rows
     
     # Stats
     likes_count = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     comments_count = models.IntegerField(default=0, validators=[MinValueValidator(0)])
+    reactions_count = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     
     # Reputation
     reputation_gained = models.IntegerField(default=0, validators=[MinValueValidator(0)])
@@ -232,12 +304,83 @@ class Post(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Feeds only read visible posts, newest first
+            models.Index(fields=['-created_at'], name='post_visible_recent_idx',
+                         condition=models.Q(is_hidden=False)),
+            models.Index(fields=['topic', '-created_at'], name='post_topic_recent_idx',
+                         condition=models.Q(is_hidden=False)),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.creator.username}"
 
+    def _media_urls(self, kind):
+        # Filters in Python so a prefetched `media` is reused
+        return [media.url for media in self.media.all() if media.kind == kind]
+
+    @property
+    def images(self):
+        return self._media_urls('image')
+
+    @property
+    def videos(self):
+        return self._media_urls('video')
+
+    @property
+    def gifs(self):
+        return self._media_urls('gif')
+
+    @property
+    def links(self):
+        return self._media_urls('link')
+
+    def set_media(self, media):
+        """Replace media lists, e.g. {'images': [...], 'links': [...]}"""
+        kinds = [PostMedia.FIELD_KINDS[field] for field in media]
+        if not kinds:
+            return
+        self.media.filter(kind__in=kinds).delete()
+        PostMedia.objects.bulk_create([
+            PostMedia(post=self, kind=PostMedia.FIELD_KINDS[field], url=url, order=order)
+            for field, urls in media.items()
+            for order, url in enumerate(urls)
+        ])
+
+
+class PostMedia(models.Model):
+    """Image/video/GIF/link URLs attached to a post"""
+    KIND_CHOICES = [
+        ('image', 'Image'),
+        ('video', 'Video'),
+        ('gif', 'GIF'),
+        ('link', 'Link'),
+    ]
+    
+    # Serializer field name -> kind
+    FIELD_KINDS = {
+        'images': 'image',
+        'videos': 'video',
+        'gifs': 'gif',
+        'links': 'link',
+    }
+    
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='media')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    url = models.URLField(max_length=500)
+    order = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['order']
+        indexes = [
+            models.Index(fields=['post', 'kind'], name='postmedia_post_kind_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} on post {self.post_id}"
 
-class Comment(models.Model):
+
+class Comment(CounterMixin, models.Model):
     """Comments on posts"""
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -276,19 +419,42 @@ class Comment(models.Model):
     def __str__(self):
         return f"Comment by {self.creator.username} on post {self.post.pk}"
 
+    @classmethod
+    def get_thread(cls, post_id):
+        """Return a post's visible comments in thread order, each with a `path` of ancestor ids"""
+        table = cls._meta.db_table
+        if connection.vendor == 'postgresql':
+            root_path, child_path = 'ARRAY[id]', 't.path || c.id'
+        else:
+            # No array type: zero-padded ids keep the text path sortable
+            root_path = "printf('%%010d', id)"
+            child_path = "t.path || '/' || printf('%%010d', c.id)"
+        
+        comments = list(cls.objects.raw(f"""
+            WITH RECURSIVE t AS (
+                SELECT {table}.*, {root_path} AS path
+                FROM {table}
+                WHERE post_id = %s AND parent_comment_id IS NULL AND is_hidden = %s
+                UNION ALL
+                SELECT c.*, {child_path}
+                FROM {table} c JOIN t ON c.parent_comment_id = t.id
+                WHERE c.is_hidden = %s
+            )
+            SELECT * FROM t ORDER BY path
+        """, [post_id, False, False]))
+        
+        for comment in comments:
+            if isinstance(comment.path, str):
+                comment.path = [int(pk) for pk in comment.path.split('/')]
+        return comments
+
 # ============================================================================
 # LIKES & REACTIONS
 # ============================================================================
 
 class Like(models.Model):
     """Likes on posts and comments - affects reputation"""
-    CONTENT_TYPES = [
-        ('post', 'Post'),
-        ('comment', 'Comment'),
-    ]
-    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='likes_given')
-    content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes', 
                             null=True, blank=True)
     comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='likes', 
@@ -300,22 +466,35 @@ class Like(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ('user', 'content_type', 'post', 'comment')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='uniq_like_user_post',
+                                    condition=models.Q(post__isnull=False)),
+            models.UniqueConstraint(fields=['user', 'comment'], name='uniq_like_user_comment',
+                                    condition=models.Q(comment__isnull=False)),
+            models.CheckConstraint(
+                condition=(models.Q(post__isnull=False, comment__isnull=True)
+                           | models.Q(post__isnull=True, comment__isnull=False)),
+                name='like_single_target'
+            ),
+        ]
+        # (user, post) and (user, comment) lookups use the unique constraints' indexes
+        indexes = [
+            models.Index(fields=['post', 'created_at'], name='like_post_created_idx',
+                         condition=models.Q(post__isnull=False)),
+        ]
     
     def __str__(self):
         content = self.post if self.post else self.comment
         return f"{self.user.username} liked {content}"
 
+    @property
+    def content_type(self):
+        return 'post' if self.post_id is not None else 'comment'
+
 
 class Reaction(models.Model):
     """Emoji reactions on posts and comments - doesn't affect reputation"""
-    CONTENT_TYPES = [
-        ('post', 'Post'),
-        ('comment', 'Comment'),
-    ]
-    
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reactions_given')
-    content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='reactions', 
                             null=True, blank=True)
     comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='reactions', 
@@ -326,12 +505,30 @@ class Reaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
-        unique_together = ('user', 'content_type', 'post', 'comment', 'emoji')
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post', 'emoji'], name='uniq_reaction_user_post',
+                                    condition=models.Q(post__isnull=False)),
+            models.UniqueConstraint(fields=['user', 'comment', 'emoji'], name='uniq_reaction_user_comment',
+                                    condition=models.Q(comment__isnull=False)),
+            models.CheckConstraint(
+                condition=(models.Q(post__isnull=False, comment__isnull=True)
+                           | models.Q(post__isnull=True, comment__isnull=False)),
+                name='reaction_single_target'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['post', 'emoji'], name='reaction_post_emoji_idx',
+                         condition=models.Q(post__isnull=False)),
+        ]
     
     def __str__(self):
         content = self.post if self.post else self.comment
         return f"{self.user.username} reacted {self.emoji} to {content}"
 
+    @property
+    def content_type(self):
+        return 'post' if self.post_id is not None else 'comment'
+
 
 # ============================================================================
 # POLLS & VOTING
@@ -352,14 +549,26 @@ class Poll(models.Model):
     
     # Duration management
     created_at = models.DateTimeField(auto_now_add=True)
+    ends_at = models.DateTimeField()  # created_at + duration_hours, kept by save()
     ended_at = models.DateTimeField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['ends_at'], name='poll_open_ends_at_idx',
+                         condition=models.Q(ended_at__isnull=True)),
+        ]
+    
     @property
     def is_active(self):
-        if self.ended_at:
-            return False
-        expiry = self.created_at + timezone.timedelta(hours=self.duration_hours)
-        return timezone.now() < expiry
+        return self.ended_at is None and timezone.now() < self.ends_at
+    
+    def save(self, *args, **kwargs):
+        started = self.created_at or timezone.now()
+        self.ends_at = started + timezone.timedelta(hours=self.duration_hours)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'duration_hours' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'ends_at'}
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return self.question
@@ -398,15 +607,9 @@ class PollVote(models.Model):
 # FACT-CHECKING & COMMUNITY NOTES
 # ============================================================================
 
-class FactCheckNote(models.Model):
+class FactCheckNote(CounterMixin, models.Model):
     """Community fact-checking notes (Twitter-style)"""
-    CONTENT_TYPES = [
-        ('post', 'Post'),
-        ('comment', 'Comment'),
-    ]
-    
     creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='fact_check_notes')
-    content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='fact_check_notes', 
                             null=True, blank=True)
     comment = models.ForeignKey(Comment, on_delete=models.CASCADE, related_name='fact_check_notes', 
@@ -428,11 +631,22 @@ class FactCheckNote(models.Model):
     
     class Meta:
         ordering = ['-helpful_count', '-created_at']
+        constraints = [
+            models.CheckConstraint(
+                condition=(models.Q(post__isnull=False, comment__isnull=True)
+                           | models.Q(post__isnull=True, comment__isnull=False)),
+                name='factchecknote_single_target'
+            ),
+        ]
     
     def __str__(self):
         content = self.post if self.post else self.comment
         return f"Note on {content} by {self.creator.username}"
 
+    @property
+    def content_type(self):
+        return 'post' if self.post_id is not None else 'comment'
+
 
 class FactCheckVote(models.Model):
     """Users voting on fact-check notes"""
@@ -481,10 +695,12 @@ class Flag(models.Model):
         ('user', 'User'),
     ]
     
+    # Indexed below together with created_at, for the "my flags" list
     flagger = models.ForeignKey(User, on_delete=models.CASCADE, related_name='flags_created',
-                               null=True, blank=True)  # Anonymous if null
+                               null=True, blank=True, db_index=False)  # Anonymous if null
     identified_flagger = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
-                                          related_name='identified_flags')  # If flagger chose to identify
+                                          related_name='identified_flags',
+                                          db_index=False)  # If flagger chose to identify
     
     content_type = models.CharField(max_length=20, choices=CONTENT_TYPES)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='flags', 
@@ -508,6 +724,14 @@ class Flag(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='flag_status_created_idx'),
+            models.Index(fields=['post', 'status'], name='flag_post_status_idx',
+                         condition=models.Q(post__isnull=False)),
+            # Each side of FlagViewSet's flagger OR identified_flagger filter, in list order
+            models.Index(fields=['flagger', '-created_at'], name='flag_flagger_created_idx'),
+            models.Index(fields=['identified_flagger', '-created_at'], name='flag_identified_created_idx'),
+        ]
     
     def __str__(self):
         content = self.post or self.comment or self.flagged_user
@@ -1,27 +1,93 @@
+from functools import cached_property
+from operator import attrgetter
+
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
 from django.contrib.auth.models import User
+from django.db import transaction, connection
+from django.db.models import Count, F, Q, Case, When, Value, FloatField, Prefetch
+from django.db.models.functions import Round
 from .models import (
     ReputationTier, UserProfile, UserFollowing,
     Topic, TopicFollowing,
     Moderation, BanAppeal,
-    Post, Comment,
+    Post, PostMedia, Comment,
     Like, Reaction,
     Poll, PollOption, PollVote,
     FactCheckNote, FactCheckVote,
     Flag,
+    get_default_reputation_tier_pk,
 )
 
+def validate_single_target(serializer, attrs):
+    """Likes, reactions and notes point at exactly one of post/comment"""
+    post = attrs.get('post', getattr(serializer.instance, 'post', None))
+    comment = attrs.get('comment', getattr(serializer.instance, 'comment', None))
+    if (post is None) == (comment is None):
+        raise serializers.ValidationError('Provide exactly one of post or comment.')
+    return attrs
+
+
+class PlainFieldsMixin:
+    """Read plain attribute fields straight off the instance.
+
+    DRF resolves every field of every row through get_attribute/to_representation.
+    For int/str/bool/float fields backed by a single model attribute that comes
+    down to a getattr and a cast, so those are planned once per serializer and
+    everything else, including a source that turns out to be a method, goes
+    through the usual DRF path.
+    """
+    PLAIN_FIELDS = {
+        serializers.IntegerField: int,
+        serializers.CharField: str,
+        serializers.BooleanField: bool,
+        serializers.FloatField: float,
+    }
+    
+    @cached_property
+    def _field_plan(self):
+        plan = []
+        for field in self._readable_fields:
+            convert = self.PLAIN_FIELDS.get(type(field))
+            if convert is not None and len(field.source_attrs) == 1:
+                plan.append((field, attrgetter(field.source), convert))
+            else:
+                plan.append((field, None, None))
+        return plan
+    
+    def to_representation(self, instance):
+        ret = {}
+        for field, getter, convert in self._field_plan:
+            if getter is not None:
+                try:
+                    value = getter(instance)
+                except AttributeError:
+                    pass  # Let DRF decide whether to skip the field
+                else:
+                    if not callable(value):  # DRF calls methods for us
+                        ret[field.field_name] = None if value is None else convert(value)
+                        continue
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
+
+
 # ============================================================================
 # USER & AUTHENTICATION SERIALIZERS
 # ============================================================================
 
-class ReputationTierSerializer(serializers.ModelSerializer):
+class ReputationTierSerializer(PlainFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ReputationTier
         fields = ['id', 'tier_number', 'min_points', 'reputation_multiplier', 'description']
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(PlainFieldsMixin, serializers.ModelSerializer):
     """User profile with reputation info"""
     reputation_tier = ReputationTierSerializer(read_only=True)
     user_id = serializers.IntegerField(source='user.id', read_only=True)
@@ -39,6 +105,68 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'followers_count', 'following_count',
             'account_created', 'last_activity'
         ]
+    
+    def to_representation(self, instance):
+        # Authors repeat across a page, so render each profile once per request
+        request = self.context.get('request')
+        if request is None or not isinstance(instance, UserProfile):
+            return super().to_representation(instance)
+        rendered = getattr(request, '_profile_cache', None)
+        if rendered is None:
+            rendered = request._profile_cache = {}
+        key = (type(self), instance.pk)
+        if key not in rendered:
+            rendered[key] = super().to_representation(instance)
+        return dict(rendered[key])
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join user and tier, skipping the user columns the serializer never shows"""
+        return queryset.select_related('user', 'reputation_tier').only(
+            'id', 'bio', 'profile_picture', 'country', 'location', 'display_name',
+            'reputation_points',
+            'posts_count', 'comments_count', 'topics_created_count',
+            'likes_given_count', 'likes_received_count',
+            'followers_count', 'following_count',
+            'account_created', 'last_activity',
+            'user__id', 'user__username', 'user__email',
+            *(f'reputation_tier__{field}' for field in ReputationTierSerializer.Meta.fields),
+        )
+
+
+class NestedUserProfileSerializer(UserProfileSerializer):
+    """Author summary embedded in other objects, read from `<user field>.profile`"""
+    
+    class Meta(UserProfileSerializer.Meta):
+        fields = [
+            'id', 'user_id', 'username', 'display_name', 'profile_picture',
+            'reputation_points', 'reputation_tier',
+        ]
+    
+    # Joined user and profile columns the summary never renders
+    UNUSED_COLUMNS = (
+        'password', 'last_login', 'is_superuser', 'first_name', 'last_name',
+        'email', 'is_staff', 'is_active', 'date_joined',
+        'profile__bio', 'profile__country', 'profile__location',
+        'profile__posts_count', 'profile__comments_count', 'profile__topics_created_count',
+        'profile__likes_given_count', 'profile__likes_received_count',
+        'profile__followers_count', 'profile__following_count',
+        'profile__account_created', 'profile__last_activity',
+    )
+    
+    @classmethod
+    def join_profiles(cls, queryset, *user_fields):
+        """Join the profile and tier behind each user FK, leaving out unused columns"""
+        return queryset.select_related(
+            *(f'{field}__profile__reputation_tier' for field in user_fields)
+        ).defer(*(f'{field}__{column}' for field in user_fields for column in cls.UNUSED_COLUMNS))
+
+class UserMiniSerializer(serializers.Serializer):
+    """Lean user summary for embedding in list rows"""
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    profile_picture = serializers.URLField(source='profile.profile_picture', read_only=True)
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Basic user info"""
@@ -61,16 +189,38 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError({"password": "Passwords must match."})
         return attrs
     
+    @transaction.atomic
     def create(self, validated_data):
         validated_data.pop('password2')
-        user = User.objects.create_user(**validated_data)
-        UserProfile.objects.create(user=user)  # Auto-create profile
-        return user
+        # The post_save signal creates the profile inside the same transaction
+        return User.objects.create_user(**validated_data)
+
+
+@transaction.atomic
+def bulk_register(users_data, batch_size=1000):
+    """Create many users and their profiles with batched INSERTs.
+
+    `users_data` is a list of dicts with username, email and password.
+    bulk_create skips post_save, so profiles are created here instead of by the signal.
+    """
+    users = []
+    for data in users_data:
+        user = User(username=data['username'], email=data.get('email', ''))
+        user.set_password(data['password'])
+        users.append(user)
+    users = User.objects.bulk_create(users, batch_size=batch_size)
+    
+    tier_id = get_default_reputation_tier_pk()
+    UserProfile.objects.bulk_create(
+        [UserProfile(user=user, reputation_tier_id=tier_id) for user in users],
+        batch_size=batch_size
+    )
+    return users
 
 
 class UserFollowingSerializer(serializers.ModelSerializer):
-    follower = UserProfileSerializer(read_only=True)
-    following = UserProfileSerializer(read_only=True)
+    follower = UserMiniSerializer(read_only=True)
+    following = UserMiniSerializer(read_only=True)
     
     class Meta:
         model = UserFollowing
@@ -81,9 +231,30 @@ class UserFollowingSerializer(serializers.ModelSerializer):
 # TOPIC SERIALIZERS
 # ============================================================================
 
-class TopicSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
-    moderators = UserProfileSerializer(many=True, read_only=True)
+class TopicSerializer(PlainFieldsMixin, serializers.ModelSerializer):
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
+    moderator_usernames = serializers.SerializerMethodField()
+    is_following = serializers.SerializerMethodField()
+    
+    def get_moderator_usernames(self, obj):
+        # Aggregated by prefetch_queryset on PostgreSQL
+        if hasattr(obj, 'moderator_usernames'):
+            return obj.moderator_usernames or []
+        return [moderator.username for moderator in obj.moderators.all()]
+    
+    def get_is_following(self, obj):
+        # Annotated by TopicViewSet.get_queryset
+        if hasattr(obj, 'followed_by_me'):
+            return obj.followed_by_me
+        # Nested topics and create responses: one query per request answers them all
+        request = self.context.get('request')
+        if not (request and request.user.is_authenticated):
+            return False
+        if not hasattr(request, '_followed_topic_ids'):
+            request._followed_topic_ids = set(
+                TopicFollowing.objects.filter(user=request.user).values_list('topic_id', flat=True)
+            )
+        return obj.id in request._followed_topic_ids
     
     class Meta:
         model = Topic
@@ -91,7 +262,7 @@ class TopicSerializer(serializers.ModelSerializer):
             'id', 'creator', 'name', 'description', 'icon',
             'allow_images', 'allow_videos', 'allow_gifs', 'allow_links',
             'allow_posts_by_others',
-            'moderators',
+            'moderator_usernames', 'is_following',
             'posts_count', 'followers_count', 'reputation_points_earned',
             'created_at', 'last_updated'
         ]
@@ -99,6 +270,19 @@ class TopicSerializer(serializers.ModelSerializer):
             'posts_count', 'followers_count', 'reputation_points_earned',
             'created_at', 'last_updated'
         ]
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Collect moderator usernames in the same query where the database allows it"""
+        queryset = NestedUserProfileSerializer.join_profiles(queryset, 'creator')
+        if connection.vendor == 'postgresql':
+            from django.contrib.postgres.aggregates import ArrayAgg
+            return queryset.annotate(moderator_usernames=ArrayAgg(
+                'moderators__username', filter=Q(moderators__isnull=False), distinct=True
+            ))
+        return queryset.prefetch_related(
+            Prefetch('moderators', queryset=User.objects.only('id', 'username'))
+        )
 
 
 class TopicFollowingSerializer(serializers.ModelSerializer):
@@ -113,8 +297,9 @@ class TopicFollowingSerializer(serializers.ModelSerializer):
 # POST & COMMENT SERIALIZERS
 # ============================================================================
 
-class PostSerializer(serializers.ModelSerializer):
-    creator = serializers.SerializerMethodField()
+class PostSerializer(PlainFieldsMixin, serializers.ModelSerializer):
+    # Users created outside the signal (e.g. by migrations) have no profile and render as null
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
     topic = TopicSerializer(read_only=True)
     topic_id = serializers.PrimaryKeyRelatedField(
         queryset=Topic.objects.all(),
@@ -122,19 +307,36 @@ class PostSerializer(serializers.ModelSerializer):
         write_only=True
     )
     is_liked = serializers.SerializerMethodField()
-    comments_count = serializers.IntegerField(source='comments.count', read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+    images = serializers.ListField(child=serializers.URLField(max_length=500), required=False)
+    videos = serializers.ListField(child=serializers.URLField(max_length=500), required=False)
+    gifs = serializers.ListField(child=serializers.URLField(max_length=500), required=False)
+    links = serializers.ListField(child=serializers.URLField(max_length=500), required=False)
     
-    def get_creator(self, obj):
-        try:
-            profile = obj.creator.profile
-            return UserProfileSerializer(profile).data
-        except:
-            return None
+    def _pop_media(self, validated_data):
+        return {
+            field: validated_data.pop(field)
+            for field in PostMedia.FIELD_KINDS
+            if field in validated_data
+        }
+    
+    def create(self, validated_data):
+        media = self._pop_media(validated_data)
+        post = super().create(validated_data)
+        post.set_media(media)
+        return post
+    
+    def update(self, instance, validated_data):
+        media = self._pop_media(validated_data)
+        post = super().update(instance, validated_data)
+        post.set_media(media)
+        return post
     
     def get_is_liked(self, obj):
+        # Annotated by PostViewSet.get_queryset
+        if hasattr(obj, 'liked_by_me'):
+            return obj.liked_by_me
         request = self.context.get('request')
-        print(f"Request in context: {request}")
-        print(f"User authenticated: {request.user.is_authenticated if request else 'No request'}")
         if request and request.user.is_authenticated:
             return Like.objects.filter(
                 user=request.user,
@@ -147,20 +349,30 @@ class PostSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'creator', 'topic', 'topic_id', 'title', 'content',
             'images', 'videos', 'gifs', 'links',
-            'likes_count', 'comments_count',
+            'likes_count', 'comments_count', 'reactions_count',
             'is_liked',  # Add this
             'reputation_gained',
             'is_hidden',
             'created_at', 'updated_at'
         ]
         read_only_fields = [
-            'likes_count', 'comments_count', 'reputation_gained',
+            'likes_count', 'comments_count', 'reactions_count', 'reputation_gained',
             'created_at', 'updated_at'
         ]
-
-
-class CommentSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the creator profile and topic, prefetch moderators and media"""
+        return NestedUserProfileSerializer.join_profiles(
+            queryset, 'creator', 'topic__creator'
+        ).prefetch_related(
+            Prefetch('topic__moderators', queryset=User.objects.only('id', 'username')),
+            Prefetch('media', queryset=PostMedia.objects.order_by('order')),
+        )
+
+
+class CommentSerializer(PlainFieldsMixin, serializers.ModelSerializer):
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
     post = PostSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
     
@@ -182,10 +394,46 @@ class CommentSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the creator and the nested post with everything PostSerializer renders"""
+        return NestedUserProfileSerializer.join_profiles(
+            queryset, 'creator', 'post__creator', 'post__topic__creator'
+        ).prefetch_related(
+            Prefetch('post__topic__moderators', queryset=User.objects.only('id', 'username')),
+            Prefetch('post__media', queryset=PostMedia.objects.order_by('order')),
+        )
+    
+    @cached_property
+    def _replies_serializer(self):
+        return CommentSerializer(many=True, context=self.context)
+    
     def get_replies(self, obj):
         """Get nested replies"""
-        replies = obj.replies.all()
-        return CommentSerializer(replies, many=True).data
+        # Attached by CommentViewSet from a single query per page
+        replies = getattr(obj, '_prefetched_replies', None)
+        if replies is None:
+            replies = obj.replies.all()
+        return self._replies_serializer.to_representation(replies)
+
+
+class CommentThreadSerializer(PlainFieldsMixin, serializers.ModelSerializer):
+    """Flat comment row from Comment.get_thread; clients nest by `path`"""
+    # Users created outside the signal (e.g. by migrations) have no profile and render as null
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
+    path = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    
+    class Meta:
+        model = Comment
+        fields = [
+            'id', 'creator', 'post', 'parent_comment', 'path',
+            'content',
+            'images', 'videos', 'gifs', 'links',
+            'likes_count', 'reactions_count',
+            'reputation_gained',
+            'is_edited',
+            'created_at', 'updated_at'
+        ]
 
 
 # ============================================================================
@@ -193,7 +441,7 @@ class CommentSerializer(serializers.ModelSerializer):
 # ============================================================================
 
 class LikeSerializer(serializers.ModelSerializer):
-    user = UserProfileSerializer(read_only=True)
+    user = UserMiniSerializer(read_only=True)
     
     class Meta:
         model = Like
@@ -205,7 +453,7 @@ class LikeSerializer(serializers.ModelSerializer):
 
 
 class ReactionSerializer(serializers.ModelSerializer):
-    user = UserProfileSerializer(read_only=True)
+    user = UserMiniSerializer(read_only=True)
     
     class Meta:
         model = Reaction
@@ -214,26 +462,41 @@ class ReactionSerializer(serializers.ModelSerializer):
             'emoji', 'created_at'
         ]
         read_only_fields = ['created_at']
+    
+    def validate(self, attrs):
+        return validate_single_target(self, attrs)
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the user and the profile UserMiniSerializer reads the picture from"""
+        return queryset.select_related('user__profile').only(
+            *(field.attname for field in Reaction._meta.concrete_fields),
+            'user__id', 'user__username', 'user__profile__id', 'user__profile__profile_picture',
+        )
 
 
 # ============================================================================
 # POLL SERIALIZERS
 # ============================================================================
 
-class PollOptionSerializer(serializers.ModelSerializer):
-    vote_count = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = PollOption
-        fields = ['id', 'text', 'order', 'vote_count']
-    
-    def get_vote_count(self, obj):
-        return obj.votes.count()
-
-
 class PollSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
-    options = PollOptionSerializer(many=True, read_only=True)
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
+    options = serializers.SerializerMethodField()
+    
+    def get_options(self, obj):
+        # Plain {id, text, order, vote_count} dicts, without a nested serializer per poll
+        if 'options' in getattr(obj, '_prefetched_objects_cache', {}):
+            # Annotated with vote_count by prefetch_queryset
+            return [
+                {'id': option.id, 'text': option.text, 'order': option.order,
+                 'vote_count': option.vote_count}
+                for option in obj.options.all()
+            ]
+        return list(
+            obj.options.annotate(vote_count=Count('votes'))
+            .order_by('order')
+            .values('id', 'text', 'order', 'vote_count')
+        )
     
     class Meta:
         model = Poll
@@ -243,15 +506,23 @@ class PollSerializer(serializers.ModelSerializer):
             'duration_hours', 'can_end_manually',
             'options',
             'is_active',
-            'created_at', 'ended_at'
+            'created_at', 'ends_at', 'ended_at'
         ]
         read_only_fields = [
-            'is_active', 'created_at', 'ended_at'
+            'is_active', 'created_at', 'ends_at', 'ended_at'
         ]
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the creator and count votes for every option in one grouped query"""
+        return NestedUserProfileSerializer.join_profiles(queryset, 'creator').prefetch_related(Prefetch(
+            'options',
+            queryset=PollOption.objects.annotate(vote_count=Count('votes')).order_by('order')
+        ))
 
 
 class PollVoteSerializer(serializers.ModelSerializer):
-    user = UserProfileSerializer(read_only=True)
+    user = NestedUserProfileSerializer(source='user.profile', read_only=True)
     
     class Meta:
         model = PollVote
@@ -264,7 +535,7 @@ class PollVoteSerializer(serializers.ModelSerializer):
 # ============================================================================
 
 class FactCheckNoteSerializer(serializers.ModelSerializer):
-    creator = UserProfileSerializer(read_only=True)
+    creator = NestedUserProfileSerializer(source='creator.profile', read_only=True)
     helpful_ratio = serializers.SerializerMethodField()
     
     class Meta:
@@ -281,8 +552,24 @@ class FactCheckNoteSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
+    def validate(self, attrs):
+        return validate_single_target(self, attrs)
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        """Join the creator and compute helpful_ratio in the database"""
+        total = F('helpful_count') + F('unhelpful_count')
+        return NestedUserProfileSerializer.join_profiles(queryset, 'creator').annotate(helpful_ratio=Case(
+            When(Q(helpful_count=0, unhelpful_count=0), then=Value(0.0)),
+            default=Round(Value(100.0) * F('helpful_count') / total, 2),
+            output_field=FloatField(),
+        ))
+    
     def get_helpful_ratio(self, obj):
         """Calculate helpful ratio"""
+        # Annotated by prefetch_queryset
+        if hasattr(obj, 'helpful_ratio'):
+            return obj.helpful_ratio
         total = obj.helpful_count + obj.unhelpful_count
         if total == 0:
             return 0
@@ -290,7 +577,7 @@ class FactCheckNoteSerializer(serializers.ModelSerializer):
 
 
 class FactCheckVoteSerializer(serializers.ModelSerializer):
-    user = UserProfileSerializer(read_only=True)
+    user = NestedUserProfileSerializer(source='user.profile', read_only=True)
     
     class Meta:
         model = FactCheckVote
@@ -302,8 +589,11 @@ class FactCheckVoteSerializer(serializers.ModelSerializer):
 
 
 class FlagSerializer(serializers.ModelSerializer):
-    identified_flagger = UserProfileSerializer(read_only=True)
-    reviewed_by = UserProfileSerializer(read_only=True)
+    # Nullable FKs: allow_null renders a missing user as null instead of dropping the key
+    identified_flagger = NestedUserProfileSerializer(
+        source='identified_flagger.profile', read_only=True, allow_null=True
+    )
+    reviewed_by = NestedUserProfileSerializer(source='reviewed_by.profile', read_only=True, allow_null=True)
     
     class Meta:
         model = Flag
@@ -318,11 +608,22 @@ class FlagSerializer(serializers.ModelSerializer):
             'status', 'reviewed_by', 'review_notes',
             'created_at', 'reviewed_at'
         ]
+    
+    @classmethod
+    def prefetch_queryset(cls, queryset):
+        return NestedUserProfileSerializer.join_profiles(queryset, 'identified_flagger', 'reviewed_by')
+
+
+class FlagReviewSerializer(serializers.Serializer):
+    """One entry of a bulk review request"""
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(Flag.STATUS_CHOICES)
+    review_notes = serializers.CharField(required=False, allow_blank=True)
 
 
 class ModerationSerializer(serializers.ModelSerializer):
-    moderator = UserProfileSerializer(read_only=True)
-    target_user = UserProfileSerializer(read_only=True)
+    moderator = NestedUserProfileSerializer(source='moderator.profile', read_only=True, allow_null=True)
+    target_user = NestedUserProfileSerializer(source='target_user.profile', read_only=True)
     
     class Meta:
         model = Moderation
@@ -335,7 +636,7 @@ class ModerationSerializer(serializers.ModelSerializer):
 
 
 class BanAppealSerializer(serializers.ModelSerializer):
-    banned_user = UserProfileSerializer(read_only=True)
+    banned_user = NestedUserProfileSerializer(source='banned_user.profile', read_only=True)
     
     class Meta:
         model = BanAppeal
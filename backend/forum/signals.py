@@ -1,90 +1,88 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Like, FactCheckVote, UserProfile, Post, Comment, Topic, ReputationTier
+from django.db import transaction
+from django.core.cache import cache
+from .models import (
+    Like, FactCheckNote, FactCheckVote, UserProfile, Post, Comment, Topic, ReputationTier,
+    get_tier_bands, shifted, TIER_LIST_CACHE_KEY, FACT_CHECK_LIST_VERSION_KEY,
+)
 
 # ============================================================================
 # LIKE SIGNALS - Auto-update reputation
 # ============================================================================
 
+def adjust_like_counters(author_id, liker_id, reputation_value, step):
+    """Move the author's and liker's like counters in one UPDATE; step is +1 or -1"""
+    UserProfile.bump_rows('user_id', [
+        (author_id, 'reputation_points', step * reputation_value),
+        (author_id, 'likes_received_count', step),
+        (liker_id, 'likes_given_count', step),
+    ])
+
+
 @receiver(post_save, sender=Like)
+@transaction.atomic
 def update_reputation_on_like(sender, instance, created, **kwargs):
     """When a like is created, update author's reputation"""
     if not created:
         return  # Only on creation, not updates
     
+    content = instance.post if instance.post_id else instance.comment
+    if content is None:
+        return
+    
     # Get the liker's tier multiplier
-    liker_profile = instance.user.profile
-    liker_tier = liker_profile.reputation_tier
-    reputation_value = int(liker_tier.reputation_multiplier)
+    multiplier = UserProfile.objects.filter(user_id=instance.user_id).values_list(
+        'reputation_tier__reputation_multiplier', flat=True
+    ).get()
+    reputation_value = int(multiplier)
     
     # Posts are worth 1.5x comments
     if instance.content_type == 'post':
         reputation_value = int(reputation_value * 1.5)
     
     instance.reputation_value = reputation_value
-    instance.save(update_fields=['reputation_value'])
+    Like.objects.filter(pk=instance.pk).update(reputation_value=reputation_value)
     
-    # Update the author's reputation
-    if instance.post:
-        author = instance.post.creator
-        post = instance.post
-        post.reputation_gained += reputation_value
-        post.save(update_fields=['reputation_gained'])
-    elif instance.comment:
-        author = instance.comment.creator
-        comment = instance.comment
-        comment.reputation_gained += reputation_value
-        comment.save(update_fields=['reputation_gained'])
-    else:
-        return
-    
-    # Update author profile
-    author_profile = author.profile
-    author_profile.reputation_points += reputation_value
-    author_profile.likes_received_count += 1
-    author_profile.save(update_fields=['reputation_points', 'likes_received_count'])
+    # Update the content's reputation
+    type(content).objects.filter(pk=content.pk).update(
+        reputation_gained=shifted('reputation_gained', reputation_value)
+    )
     
-    # Update liker's count
-    liker_profile.likes_given_count += 1
-    liker_profile.save(update_fields=['likes_given_count'])
+    # Update author and liker profiles
+    adjust_like_counters(content.creator_id, instance.user_id, reputation_value, 1)
     
     # Check if author crossed tier threshold
-    author_profile.update_reputation_tier()
+    if reputation_value:
+        UserProfile.retier(user_id=content.creator_id)
 
 
-@receiver(post_delete, sender=Like)
+# pre_delete rather than post_delete: when a post or comment is deleted, its
+# likes go in the same cascade, and only before it runs do the liked rows
+# (and with them the author to debit) still exist
+@receiver(pre_delete, sender=Like)
+@transaction.atomic
 def remove_reputation_on_like_delete(sender, instance, **kwargs):
     """When a like is deleted, remove reputation"""
+    # Views fetch likes through post.likes / comment.likes, so this is cached
+    content = instance.post if instance.post_id else instance.comment
+    if content is None:
+        return
+    
     reputation_value = instance.reputation_value
     
     # Update the content's reputation
-    if instance.post:
-        author = instance.post.creator
-        post = instance.post
-        post.reputation_gained = max(0, post.reputation_gained - reputation_value)
-        post.save(update_fields=['reputation_gained'])
-    elif instance.comment:
-        author = instance.comment.creator
-        comment = instance.comment
-        comment.reputation_gained = max(0, comment.reputation_gained - reputation_value)
-        comment.save(update_fields=['reputation_gained'])
-    else:
-        return
-    
-    # Update author profile
-    author_profile = author.profile
-    author_profile.reputation_points = max(0, author_profile.reputation_points - reputation_value)
-    author_profile.likes_received_count = max(0, author_profile.likes_received_count - 1)
-    author_profile.save(update_fields=['reputation_points', 'likes_received_count'])
+    type(content).objects.filter(pk=content.pk).update(
+        reputation_gained=shifted('reputation_gained', -reputation_value)
+    )
     
-    # Update liker's count
-    liker_profile = instance.user.profile
-    liker_profile.likes_given_count = max(0, liker_profile.likes_given_count - 1)
-    liker_profile.save(update_fields=['likes_given_count'])
+    # Update author and liker profiles
+    adjust_like_counters(content.creator_id, instance.user_id, reputation_value, -1)
     
     # Recheck tier
-    author_profile.update_reputation_tier()
+    if reputation_value:
+        UserProfile.retier(user_id=content.creator_id)
 
 
 # ============================================================================
@@ -97,28 +95,26 @@ def update_topic_on_post_create(sender, instance, created, **kwargs):
     if not created:
         return
     
-    # Update topic
-    topic = instance.topic
-    topic.posts_count += 1
-    topic.last_updated = instance.created_at
-    topic.save(update_fields=['posts_count', 'last_updated'])
-    
-    # Update creator profile
-    creator_profile = instance.creator.profile
-    creator_profile.posts_count += 1
-    creator_profile.save(update_fields=['posts_count'])
+    with transaction.atomic():
+        # Update topic
+        Topic.objects.filter(pk=instance.topic_id).update(
+            posts_count=shifted('posts_count', 1),
+            last_updated=instance.created_at,
+        )
+        
+        # Update creator profile
+        UserProfile.objects.filter(user_id=instance.creator_id).update(
+            posts_count=shifted('posts_count', 1)
+        )
 
 
 @receiver(post_delete, sender=Post)
 def update_topic_on_post_delete(sender, instance, **kwargs):
     """When a post is deleted, update topic and creator stats"""
-    topic = instance.topic
-    topic.posts_count = max(0, topic.posts_count - 1)
-    topic.save(update_fields=['posts_count'])
-    
-    creator_profile = instance.creator.profile
-    creator_profile.posts_count = max(0, creator_profile.posts_count - 1)
-    creator_profile.save(update_fields=['posts_count'])
+    posts_count = shifted('posts_count', -1)
+    with transaction.atomic():
+        Topic.objects.filter(pk=instance.topic_id).update(posts_count=posts_count)
+        UserProfile.objects.filter(user_id=instance.creator_id).update(posts_count=posts_count)
 
 
 @receiver(post_save, sender=Comment)
@@ -127,27 +123,23 @@ def update_post_on_comment_create(sender, instance, created, **kwargs):
     if not created:
         return
     
-    # Update post
-    post = instance.post
-    post.comments_count += 1
-    post.save(update_fields=['comments_count'])
-    
-    # Update creator profile
-    creator_profile = instance.creator.profile
-    creator_profile.comments_count += 1
-    creator_profile.save(update_fields=['comments_count'])
+    with transaction.atomic():
+        # Update post
+        Post.objects.filter(pk=instance.post_id).update(comments_count=shifted('comments_count', 1))
+        
+        # Update creator profile
+        UserProfile.objects.filter(user_id=instance.creator_id).update(
+            comments_count=shifted('comments_count', 1)
+        )
 
 
 @receiver(post_delete, sender=Comment)
 def update_post_on_comment_delete(sender, instance, **kwargs):
     """When a comment is deleted, update post and creator stats"""
-    post = instance.post
-    post.comments_count = max(0, post.comments_count - 1)
-    post.save(update_fields=['comments_count'])
-    
-    creator_profile = instance.creator.profile
-    creator_profile.comments_count = max(0, creator_profile.comments_count - 1)
-    creator_profile.save(update_fields=['comments_count'])
+    comments_count = shifted('comments_count', -1)
+    with transaction.atomic():
+        Post.objects.filter(pk=instance.post_id).update(comments_count=comments_count)
+        UserProfile.objects.filter(user_id=instance.creator_id).update(comments_count=comments_count)
 
 
 @receiver(post_save, sender=Topic)
@@ -156,30 +148,17 @@ def update_creator_on_topic_create(sender, instance, created, **kwargs):
     if not created:
         return
     
-    creator_profile = instance.creator.profile
-    creator_profile.topics_created_count += 1
-    creator_profile.save(update_fields=['topics_created_count'])
+    UserProfile.objects.filter(user_id=instance.creator_id).update(
+        topics_created_count=shifted('topics_created_count', 1)
+    )
 
 
 @receiver(post_delete, sender=Topic)
 def update_creator_on_topic_delete(sender, instance, **kwargs):
     """When a topic is deleted, update creator stats"""
-    creator_profile = instance.creator.profile
-    creator_profile.topics_created_count = max(0, creator_profile.topics_created_count - 1)
-    creator_profile.save(update_fields=['topics_created_count'])
-
-
-# ============================================================================
-# TOPIC REPUTATION - Creator gains rep from topic popularity
-# ============================================================================
-
-@receiver(post_save, sender=Topic)
-def update_topic_reputation_on_followers(sender, instance, **kwargs):
-    """Track when topics gain followers (for future notifications)"""
-    # This is a placeholder for topic-based reputation
-    # Topics gain reputation from: post count, follower count
-    # This can be calculated periodically or on demand
-    pass
+    UserProfile.objects.filter(user_id=instance.creator_id).update(
+        topics_created_count=shifted('topics_created_count', -1)
+    )
 
 
 # ============================================================================
@@ -192,25 +171,36 @@ def update_note_usefulness(sender, instance, created, **kwargs):
     if not created:
         return
     
-    note = instance.note
-    if instance.vote_type == 'helpful':
-        note.helpful_count += int(instance.vote_weight)
-    else:
-        note.unhelpful_count += int(instance.vote_weight)
-    
-    note.save(update_fields=['helpful_count', 'unhelpful_count'])
+    field = 'helpful_count' if instance.vote_type == 'helpful' else 'unhelpful_count'
+    FactCheckNote.objects.filter(pk=instance.note_id).update(
+        **{field: shifted(field, int(instance.vote_weight))}
+    )
 
 
 @receiver(post_delete, sender=FactCheckVote)
 def remove_note_vote(sender, instance, **kwargs):
     """When a fact-check vote is deleted, update note counts"""
-    note = instance.note
-    if instance.vote_type == 'helpful':
-        note.helpful_count = max(0, note.helpful_count - int(instance.vote_weight))
-    else:
-        note.unhelpful_count = max(0, note.unhelpful_count - int(instance.vote_weight))
-    
-    note.save(update_fields=['helpful_count', 'unhelpful_count'])
+    field = 'helpful_count' if instance.vote_type == 'helpful' else 'unhelpful_count'
+    FactCheckNote.objects.filter(pk=instance.note_id).update(
+        **{field: shifted(field, -int(instance.vote_weight))}
+    )
+
+
+def bump_fact_check_list_version():
+    try:
+        cache.incr(FACT_CHECK_LIST_VERSION_KEY)
+    except ValueError:  # Not set yet, or evicted
+        cache.set(FACT_CHECK_LIST_VERSION_KEY, 1, None)
+
+
+@receiver(post_save, sender=FactCheckNote)
+@receiver(post_delete, sender=FactCheckNote)
+@receiver(post_save, sender=FactCheckVote)
+@receiver(post_delete, sender=FactCheckVote)
+def expire_fact_check_lists(sender, **kwargs):
+    """A note or its vote counts changed: retire every cached note list once
+    the change is visible to readers"""
+    transaction.on_commit(bump_fact_check_list_version)
 
 
 # ============================================================================
@@ -225,27 +215,33 @@ def update_reaction_count_on_create(sender, instance, created, **kwargs):
     if not created:
         return
     
-    if instance.post:
-        post = instance.post
-        post.reactions_count = post.reactions.count()
-        post.save(update_fields=['reactions_count'])
-    elif instance.comment:
-        comment = instance.comment
-        comment.reactions_count = comment.reactions.count()
-        comment.save(update_fields=['reactions_count'])
+    if instance.post_id:
+        Post.objects.filter(pk=instance.post_id).update(reactions_count=shifted('reactions_count', 1))
+    elif instance.comment_id:
+        Comment.objects.filter(pk=instance.comment_id).update(reactions_count=shifted('reactions_count', 1))
 
 
 @receiver(post_delete, sender=Reaction)
 def update_reaction_count_on_delete(sender, instance, **kwargs):
     """When a reaction is deleted, update the content's reaction count"""
-    if instance.post:
-        post = instance.post
-        post.reactions_count = post.reactions.count()
-        post.save(update_fields=['reactions_count'])
-    elif instance.comment:
-        comment = instance.comment
-        comment.reactions_count = comment.reactions.count()
-        comment.save(update_fields=['reactions_count'])
+    reactions_count = shifted('reactions_count', -1)
+    if instance.post_id:
+        Post.objects.filter(pk=instance.post_id).update(reactions_count=reactions_count)
+    elif instance.comment_id:
+        Comment.objects.filter(pk=instance.comment_id).update(reactions_count=reactions_count)
+
+
+# ============================================================================
+# REPUTATION TIER SIGNALS - Keep the tier caches fresh
+# ============================================================================
+
+@receiver(post_save, sender=ReputationTier)
+@receiver(post_delete, sender=ReputationTier)
+def clear_tier_cache(sender, **kwargs):
+    """Tiers changed: the shared response cache is dropped for everyone, while
+    the in-process bands only refresh here (other processes on restart)"""
+    get_tier_bands.cache_clear()
+    cache.delete(TIER_LIST_CACHE_KEY)
 
 
 @receiver(post_save, sender=User)
@@ -1,3 +1,435 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from .models import (
+    ReputationTier, UserProfile, UserFollowing, Topic, TopicFollowing, Post, Comment, Like,
+    Reaction, Poll, PollOption, PollVote, Flag,
+)
+from .serializers import PlainFieldsMixin
+
+
+class ForumTestCase(TestCase):
+    """Tiers, a few users and a topic with posts; `client` is logged in as `users[0]`"""
+
+    @classmethod
+    def setUpTestData(cls):
+        ReputationTier.objects.create(tier_number=0, min_points=0, reputation_multiplier=1, description='Newcomer')
+        ReputationTier.objects.create(tier_number=1, min_points=5, reputation_multiplier=2, description='Member')
+        ReputationTier.objects.create(tier_number=3, min_points=50, reputation_multiplier=3, description='Expert')
+        cls.users = [User.objects.create_user(f'user{i}', f'user{i}@example.com', 'pw') for i in range(4)]
+        cls.topic = Topic.objects.create(name='Elections', creator=cls.users[0])
+        cls.topic.moderators.add(cls.users[1])
+        cls.posts = [
+            Post.objects.create(creator=cls.users[i % 4], topic=cls.topic, title=f'Post {i}', content='Body')
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+
+# ============================================================================
+# SERIALIZERS
+# ============================================================================
+
+class PlainFieldsMixinTests(ForumTestCase):
+    def test_method_sources_are_called(self):
+        class UserSummary(serializers.ModelSerializer):
+            name = serializers.CharField(source='get_username')
+            staff = serializers.BooleanField(source='is_staff')
+
+            class Meta:
+                model = User
+                fields = ['id', 'username', 'name', 'staff']
+
+        class PlainUserSummary(PlainFieldsMixin, UserSummary):
+            pass
+
+        self.assertEqual(
+            PlainUserSummary(self.users, many=True).data,
+            UserSummary(self.users, many=True).data
+        )
+        self.assertEqual(PlainUserSummary(self.users[1]).data['name'], 'user1')
+
+
+# ============================================================================
+# REGISTRATION
+# ============================================================================
+
+class BulkRegisterTests(ForumTestCase):
+    def test_command_creates_users_with_profiles(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write('username,email,password\nalice,alice@example.com,secret1\nbob,,secret2\n')
+        self.addCleanup(os.remove, f.name)
+
+        out = StringIO()
+        call_command('bulk_register_users', f.name, stdout=out)
+
+        self.assertIn('Registered 2 users', out.getvalue())
+        alice = User.objects.get(username='alice')
+        self.assertTrue(alice.check_password('secret1'))
+        self.assertEqual(
+            list(UserProfile.objects.filter(user__username__in=['alice', 'bob'])
+                 .values_list('reputation_tier__tier_number', flat=True)),
+            [0, 0]
+        )
+
+
+# ============================================================================
+# REPUTATION TIERS
+# ============================================================================
+
+class RecomputeTiersTests(ForumTestCase):
+    def test_command_moves_only_profiles_whose_tier_changed(self):
+        UserProfile.objects.filter(user=self.users[1]).update(reputation_points=7)
+        UserProfile.objects.filter(user=self.users[2]).update(reputation_points=60)
+
+        out = StringIO()
+        call_command('recompute_reputation_tiers', stdout=out)
+
+        self.assertIn('Updated 2 profiles', out.getvalue())
+        self.assertEqual(
+            list(UserProfile.objects.order_by('user_id').values_list('reputation_tier__tier_number', flat=True)),
+            [0, 1, 3, 0]
+        )
+
+
+# ============================================================================
+# LIKE COUNTERS
+# ============================================================================
+
+class LikeCascadeTests(ForumTestCase):
+    def like_counters(self):
+        return {
+            profile.user_id: (profile.reputation_points, profile.likes_received_count, profile.likes_given_count)
+            for profile in UserProfile.objects.all()
+        }
+
+    def test_deleting_liked_content_reverses_its_likes(self):
+        post = self.posts[0]
+        comment = Comment.objects.create(creator=self.users[2], post=post, content='Reply')
+        before = self.like_counters()
+        for user in self.users[1:]:
+            Like.objects.create(user=user, post=post)
+            Like.objects.create(user=user, comment=comment)
+
+        post.delete()  # Takes the comment and every like with it
+
+        self.assertEqual(self.like_counters(), before)
+
+
+# ============================================================================
+# QUERY COUNTS
+# ============================================================================
+
+class ListQueryCountTests(ForumTestCase):
+    """Each list endpoint costs the same number of queries however many rows
+    it renders; a serializer field that reaches past its prefetches shows up here"""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i, post in enumerate(cls.posts):
+            parent = Comment.objects.create(creator=cls.users[i % 4], post=post, content='Top')
+            Comment.objects.create(creator=cls.users[(i + 1) % 4], post=post, content='Reply', parent_comment=parent)
+            Like.objects.create(user=cls.users[(i + 1) % 4], post=post)
+            Reaction.objects.create(user=cls.users[(i + 2) % 4], post=post, emoji='👍')
+            Reaction.objects.create(user=cls.users[(i + 3) % 4], comment=parent, emoji='🎉')
+            Flag.objects.create(content_type='post', post=post, reason='spam', description='Spam',
+                                flagger=cls.users[(i + 1) % 4], identified_flagger=cls.users[(i + 1) % 4])
+        for user in cls.users[1:]:
+            UserFollowing.objects.create(follower=user, following=cls.users[0])
+            TopicFollowing.objects.create(user=user, topic=cls.topic)
+        Topic.objects.create(name='Budget', creator=cls.users[2])
+        cls.users[0].is_staff = True
+        cls.users[0].save()
+
+    def test_posts(self):
+        with self.assertNumQueries(5):
+            self.assertEqual(self.client.get('/api/posts/').status_code, 200)
+
+    def test_comments(self):
+        with self.assertNumQueries(6):
+            self.assertEqual(self.client.get('/api/comments/').status_code, 200)
+
+    def test_topics(self):
+        with self.assertNumQueries(3):
+            self.assertEqual(self.client.get('/api/topics/').status_code, 200)
+
+    def test_users(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/api/users/').status_code, 200)
+
+    def test_reactions(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/api/reactions/').status_code, 200)
+
+    def test_flags(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get('/api/flags/').status_code, 200)
+
+
+# ============================================================================
+# COMMENT THREADS
+# ============================================================================
+
+class CommentThreadTests(ForumTestCase):
+    def test_thread_is_path_ordered_and_skips_hidden_branches(self):
+        post = self.posts[0]
+        first = Comment.objects.create(creator=self.users[1], post=post, content='First')
+        second = Comment.objects.create(creator=self.users[2], post=post, content='Second')
+        reply = Comment.objects.create(creator=self.users[2], post=post, content='Reply', parent_comment=first)
+        nested = Comment.objects.create(creator=self.users[3], post=post, content='Nested', parent_comment=reply)
+        hidden = Comment.objects.create(creator=self.users[3], post=post, content='Hidden',
+                                        parent_comment=first, is_hidden=True)
+        Comment.objects.create(creator=self.users[1], post=post, content='Under hidden', parent_comment=hidden)
+        Comment.objects.create(creator=self.users[1], post=self.posts[1], content='Elsewhere')
+
+        response = self.client.get('/api/comments/thread/', {'post_id': post.id})
+
+        self.assertEqual(
+            [(comment['id'], comment['path']) for comment in response.data],
+            [
+                (first.id, [first.id]),
+                (reply.id, [first.id, reply.id]),
+                (nested.id, [first.id, reply.id, nested.id]),
+                (second.id, [second.id]),
+            ]
+        )
+
+    def test_thread_needs_an_integer_post_id(self):
+        self.assertEqual(self.client.get('/api/comments/thread/').status_code, 400)
+        self.assertEqual(self.client.get('/api/comments/thread/', {'post_id': 'abc'}).status_code, 400)
+
+
+# ============================================================================
+# LIKES, REACTIONS & FOLLOWS
+# ============================================================================
+
+class LikeTests(ForumTestCase):
+    def test_toggle_post_like_moves_counters_both_ways(self):
+        post = self.posts[1]  # By users[1]
+        author = UserProfile.objects.get(user=self.users[1])
+
+        response = self.client.post(f'/api/posts/{post.id}/like/')
+        self.assertEqual(response.data, {'liked': True, 'likes_count': 1})
+        post.refresh_from_db()
+        self.assertEqual(post.likes_count, 1)
+        liked_author = UserProfile.objects.get(user=self.users[1])
+        self.assertEqual(liked_author.likes_received_count, 1)
+        self.assertGreater(liked_author.reputation_points, author.reputation_points)
+        self.assertEqual(UserProfile.objects.get(user=self.users[0]).likes_given_count, 1)
+
+        response = self.client.post(f'/api/posts/{post.id}/like/')
+        self.assertEqual(response.data, {'liked': False, 'likes_count': 0})
+        post.refresh_from_db()
+        self.assertEqual(post.likes_count, 0)
+        unliked_author = UserProfile.objects.get(user=self.users[1])
+        self.assertEqual(unliked_author.likes_received_count, 0)
+        self.assertEqual(unliked_author.reputation_points, author.reputation_points)
+        self.assertEqual(UserProfile.objects.get(user=self.users[0]).likes_given_count, 0)
+
+    def test_comment_like_and_unlike(self):
+        comment = Comment.objects.create(creator=self.users[2], post=self.posts[0], content='Reply')
+        url = f'/api/comments/{comment.id}/'
+
+        self.assertEqual(self.client.post(url + 'like/').status_code, 201)
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 1)
+        self.assertEqual(UserProfile.objects.get(user=self.users[2]).likes_received_count, 1)
+
+        self.assertEqual(self.client.post(url + 'unlike/').status_code, 200)
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 0)
+        self.assertEqual(UserProfile.objects.get(user=self.users[2]).likes_received_count, 0)
+
+    def test_duplicate_comment_like_is_rejected(self):
+        comment = Comment.objects.create(creator=self.users[2], post=self.posts[0], content='Reply')
+        url = f'/api/comments/{comment.id}/'
+        self.client.post(url + 'like/')
+
+        response = self.client.post(url + 'like/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Already liked')
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 1)
+
+        self.client.post(url + 'unlike/')
+        response = self.client.post(url + 'unlike/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Not liked')
+
+
+class FollowTests(ForumTestCase):
+    def follow_counters(self):
+        return [
+            (profile.followers_count, profile.following_count)
+            for profile in UserProfile.objects.filter(user__in=self.users[:2]).order_by('user_id')
+        ]
+
+    def test_follow_and_unfollow_move_counters(self):
+        url = f'/api/users/{self.users[1].username}/'
+
+        self.assertEqual(self.client.post(url + 'follow/').status_code, 201)
+        self.assertEqual(self.follow_counters(), [(0, 1), (1, 0)])
+
+        response = self.client.post(url + 'follow/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Already following')
+        self.assertEqual(self.follow_counters(), [(0, 1), (1, 0)])
+
+        self.assertEqual(self.client.post(url + 'unfollow/').status_code, 200)
+        self.assertEqual(self.follow_counters(), [(0, 0), (0, 0)])
+
+        response = self.client.post(url + 'unfollow/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.follow_counters(), [(0, 0), (0, 0)])
+
+    def test_cannot_follow_yourself(self):
+        response = self.client.post(f'/api/users/{self.users[0].username}/follow/')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UserFollowing.objects.exists())
+
+
+class ReactionTests(ForumTestCase):
+    def test_duplicate_reaction_is_rejected(self):
+        reaction = {'post': self.posts[0].id, 'emoji': '👍'}
+        self.assertEqual(self.client.post('/api/reactions/', reaction, format='json').status_code, 201)
+
+        response = self.client.post('/api/reactions/', reaction, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Already reacted')
+        self.assertEqual(Reaction.objects.count(), 1)
+        self.posts[0].refresh_from_db()
+        self.assertEqual(self.posts[0].reactions_count, 1)
+
+
+# ============================================================================
+# POLLS
+# ============================================================================
+
+class PollTests(ForumTestCase):
+    def setUp(self):
+        super().setUp()
+        self.poll = Poll.objects.create(post=self.posts[0], creator=self.users[0], question='Who?')
+        self.options = [PollOption.objects.create(poll=self.poll, text=text, order=i)
+                        for i, text in enumerate(['A', 'B'])]
+        self.url = f'/api/polls/{self.poll.id}/'
+
+    def vote(self, option):
+        return self.client.post(self.url + 'vote/', {'option_id': option.id}, format='json')
+
+    def test_vote(self):
+        response = self.vote(self.options[0])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['option'], self.options[0].id)
+        self.assertEqual(response.data['user']['username'], 'user0')
+
+    def test_vote_by_user_without_profile(self):
+        UserProfile.objects.filter(user=self.users[0]).delete()
+        response = self.vote(self.options[0])
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.data['user'])
+
+    def test_vote_change_refused_unless_allowed(self):
+        self.vote(self.options[0])
+        response = self.vote(self.options[1])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(PollVote.objects.get().option_id, self.options[0].id)
+
+        Poll.objects.filter(pk=self.poll.pk).update(allow_vote_change=True)
+        response = self.vote(self.options[1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(PollVote.objects.get().option_id, self.options[1].id)
+
+    def test_vote_needs_an_option_of_this_poll(self):
+        other = Poll.objects.create(post=self.posts[1], creator=self.users[1], question='Where?')
+        foreign = PollOption.objects.create(poll=other, text='Here', order=0)
+        self.assertEqual(self.client.post(self.url + 'vote/', {}, format='json').status_code, 400)
+        self.assertEqual(self.vote(foreign).status_code, 404)
+        self.assertFalse(PollVote.objects.exists())
+
+    def test_end(self):
+        self.assertEqual(self.client.post(self.url + 'end/').status_code, 200)
+        self.poll.refresh_from_db()
+        self.assertIsNotNone(self.poll.ended_at)
+
+        response = self.client.post(self.url + 'end/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'Poll already ended')
+
+    def test_only_creator_ends_poll_and_only_if_allowed(self):
+        self.client.force_authenticate(self.users[1])
+        self.assertEqual(self.client.post(self.url + 'end/').status_code, 403)
+
+        Poll.objects.filter(pk=self.poll.pk).update(can_end_manually=False)
+        self.client.force_authenticate(self.users[0])
+        response = self.client.post(self.url + 'end/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'], 'This poll cannot be ended manually')
+        self.poll.refresh_from_db()
+        self.assertIsNone(self.poll.ended_at)
+
+
+# ============================================================================
+# FLAGS
+# ============================================================================
+
+class FlagTests(ForumTestCase):
+    def test_anonymous_unreviewed_flag_renders_null_users(self):
+        Flag.objects.create(content_type='post', post=self.posts[0], reason='spam', description='Spam')
+        self.users[0].is_staff = True
+        self.users[0].save()
+
+        flag = self.client.get('/api/flags/').data['results'][0]
+        self.assertIsNone(flag['identified_flagger'])
+        self.assertIsNone(flag['reviewed_by'])
+
+    def test_bulk_review_rejects_boolean_ids(self):
+        flag = Flag.objects.create(content_type='post', post=self.posts[0], reason='spam', description='Spam')
+        self.users[0].is_staff = True
+        self.users[0].save()
+
+        response = self.client.post(
+            '/api/flags/bulk_review/', [{'id': True, 'status': 'resolved'}], format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+        flag.refresh_from_db()
+        self.assertEqual(flag.status, 'pending')
+
+    def test_bulk_review_rejects_malformed_fields(self):
+        flag = Flag.objects.create(content_type='post', post=self.posts[0], reason='spam', description='Spam')
+        self.users[0].is_staff = True
+        self.users[0].save()
+
+        for review in [
+            {'id': flag.id, 'status': []},
+            {'id': flag.id, 'status': 'resolved', 'review_notes': {'note': 'Spam'}},
+        ]:
+            response = self.client.post('/api/flags/bulk_review/', [review], format='json')
+            self.assertEqual(response.status_code, 400)
+        flag.refresh_from_db()
+        self.assertEqual(flag.status, 'pending')
+        self.assertIsNone(flag.review_notes)
+
+    def test_bulk_review(self):
+        flag = Flag.objects.create(content_type='post', post=self.posts[0], reason='spam', description='Spam')
+        self.users[0].is_staff = True
+        self.users[0].save()
 
-# Create your tests here.
+        response = self.client.post(
+            '/api/flags/bulk_review/',
+            [{'id': flag.id, 'status': 'resolved', 'review_notes': 'Removed'}, {'id': 0, 'status': 'dismissed'}],
+            format='json'
+        )
+        self.assertEqual(response.data, {'updated': 1})
+        flag.refresh_from_db()
+        self.assertEqual((flag.status, flag.review_notes, flag.reviewed_by), ('resolved', 'Removed', self.users[0]))
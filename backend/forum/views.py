@@ -1,14 +1,20 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.fields import DateTimeField
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAuthenticatedOrReadOnly
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.generics import GenericAPIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.http import Http404
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q, Exists, OuterRef, QuerySet, prefetch_related_objects
 from django.utils import timezone
 from django.contrib.auth.models import AbstractUser, AnonymousUser, User
 from typing import TYPE_CHECKING
+from collections import defaultdict
 
 from .models import (
     ReputationTier, UserProfile, UserFollowing,
@@ -19,16 +25,18 @@ from .models import (
     Poll, PollOption, PollVote,
     FactCheckNote, FactCheckVote,
     Flag,
+    TIER_LIST_CACHE_KEY, FACT_CHECK_LIST_VERSION_KEY,
 )
 from .serializers import (
-    ReputationTierSerializer, UserProfileSerializer, UserRegistrationSerializer,
+    ReputationTierSerializer, UserProfileSerializer, NestedUserProfileSerializer,
+    UserRegistrationSerializer,
     UserFollowingSerializer,
     TopicSerializer, TopicFollowingSerializer,
-    PostSerializer, CommentSerializer,
+    PostSerializer, CommentSerializer, CommentThreadSerializer,
     LikeSerializer, ReactionSerializer,
-    PollSerializer, PollOptionSerializer, PollVoteSerializer,
-    FactCheckNoteSerializer, FactCheckVoteSerializer,
-    FlagSerializer, ModerationSerializer, BanAppealSerializer,
+    PollSerializer,
+    FactCheckNoteSerializer,
+    FlagSerializer, FlagReviewSerializer, ModerationSerializer, BanAppealSerializer,
 )
 
 AbstractUser.profile: UserProfile     # type: ignore[attr-defined]
@@ -40,42 +48,36 @@ User.profile: UserProfile             # type: ignore[attr-defined]
 @permission_classes([IsAuthenticated])
 def toggle_like(request, post_id):
     try:
-        post = Post.objects.get(id=post_id)
-        
-        # Check if already liked
-        existing_like = Like.objects.filter(user=request.user, post=post).first()
-        
-        if existing_like:
-            # Unlike
-            existing_like.delete()
-            liked = False
-        else:
-            # Like
-            Like.objects.create(
-                user=request.user,
-                post=post,
-                content_type='post'
-            )
-            liked = True
-        
-        # Manually count likes instead of relying on signals
-        post.refresh_from_db()
-        likes_count = Like.objects.filter(post=post).count()
+        with transaction.atomic():
+            post = Post.objects.only('id', 'creator_id', 'likes_count').get(id=post_id)
+            
+            # Check if already liked
+            existing_like = post.likes.select_for_update().filter(user=request.user).first()
+            
+            if existing_like:
+                # Unlike
+                existing_like.delete()
+                liked = False
+            else:
+                # Like
+                Like.objects.create(
+                    user=request.user,
+                    post=post
+                )
+                liked = True
+            
+            delta = 1 if liked else -1
+            post.bump('likes_count', delta)
         
         return Response({
             'liked': liked, 
-            'likes_count': likes_count
+            'likes_count': max(0, post.likes_count + delta)
         })
             
     except Post.DoesNotExist:
         return Response({'error': 'Post not found'}, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
-            
-    except Post.DoesNotExist:
-        return Response({'error': 'Post not found'}, status=status.HTTP_404_NOT_FOUND)
-    except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 # ============================================================================
 # PAGINATION
@@ -102,21 +104,29 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     ordering_fields = ['reputation_points', 'account_created']
     ordering = ['-reputation_points']
     
+    def get_queryset(self):
+        return UserProfileSerializer.prefetch_queryset(super().get_queryset())
+    
     def get_object(self) -> UserProfile:    # type: ignore
         """Allow fetching profile by username"""
-        from rest_framework.exceptions import NotFound
+        # A viewset instance serves one request, so repeat calls reuse the row
+        if hasattr(self, '_object'):
+            return self._object
         username = self.kwargs.get('pk')
+        queryset = self.get_queryset()
         try:
             if username and username.isdigit():
-                return UserProfile.objects.get(pk=username)
-            return UserProfile.objects.get(user__username=username)
+                self._object = queryset.get(pk=username)
+            else:
+                self._object = queryset.get(user__username=username)
         except UserProfile.DoesNotExist:
             raise NotFound("Profile not found")
+        return self._object
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def me(self, request):
         """Get current user's profile"""
-        profile = request.user.profile
+        profile = get_object_or_404(self.get_queryset(), user=request.user)
         serializer = self.get_serializer(profile)
         return Response(serializer.data)
     
@@ -124,47 +134,47 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     def follow(self, request, pk=None):
         """Follow a user"""
         user_to_follow = self.get_object()
-        follower_profile = request.user.profile
         
-        if user_to_follow.user == request.user:
+        if user_to_follow.user_id == request.user.id:
             return Response(
                 {'detail': 'Cannot follow yourself'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        following, created = UserFollowing.objects.get_or_create(
-            follower=request.user,
-            following=user_to_follow.user
-        )
-        
-        if created:
-            user_to_follow.followers_count += 1
-            user_to_follow.save(update_fields=['followers_count'])
-            follower_profile.following_count += 1
-            follower_profile.save(update_fields=['following_count'])
-            return Response({'detail': 'Followed'}, status=status.HTTP_201_CREATED)
-        else:
+        # Insert and let the unique constraint report an existing follow
+        try:
+            with transaction.atomic():
+                UserFollowing.objects.create(
+                    follower=request.user,
+                    following_id=user_to_follow.user_id
+                )
+                UserProfile.bump_rows('user_id', [
+                    (user_to_follow.user_id, 'followers_count', 1),
+                    (request.user.id, 'following_count', 1),
+                ])
+        except IntegrityError:
             return Response({'detail': 'Already following'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'detail': 'Followed'}, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def unfollow(self, request, pk=None):
         """Unfollow a user"""
         user_to_unfollow = self.get_object()
-        follower_profile = request.user.profile
         
-        try:
-            following = UserFollowing.objects.get(
+        with transaction.atomic():
+            deleted, _ = UserFollowing.objects.filter(
                 follower=request.user,
-                following=user_to_unfollow.user
-            )
-            following.delete()
-            user_to_unfollow.followers_count = max(0, user_to_unfollow.followers_count - 1)
-            user_to_unfollow.save(update_fields=['followers_count'])
-            follower_profile.following_count = max(0, follower_profile.following_count - 1)
-            follower_profile.save(update_fields=['following_count'])
-            return Response({'detail': 'Unfollowed'})
-        except UserFollowing.DoesNotExist:
+                following_id=user_to_unfollow.user_id
+            ).delete()
+            if deleted:
+                UserProfile.bump_rows('user_id', [
+                    (user_to_unfollow.user_id, 'followers_count', -1),
+                    (request.user.id, 'following_count', -1),
+                ])
+        
+        if not deleted:
             return Response({'detail': 'Not following'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'detail': 'Unfollowed'})
 
 
 class UserRegistrationViewSet(viewsets.ModelViewSet):
@@ -184,10 +194,18 @@ class UserRegistrationViewSet(viewsets.ModelViewSet):
 
 class ReputationTierViewSet(viewsets.ReadOnlyModelViewSet):
     """Read-only reputation tier info"""
-    queryset = ReputationTier.objects.all()
+    queryset = ReputationTier.objects.only(*ReputationTierSerializer.Meta.fields)
     serializer_class = ReputationTierSerializer
     permission_classes = [AllowAny]
     ordering = ['tier_number']
+    
+    def list(self, request, *args, **kwargs):
+        """Tiers are reference data; serve them from the cache for an hour at a time"""
+        data = cache.get(TIER_LIST_CACHE_KEY)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(TIER_LIST_CACHE_KEY, data, 60 * 60)
+        return Response(data)
 
 
 # ============================================================================
@@ -205,13 +223,19 @@ class TopicViewSet(viewsets.ModelViewSet):
     ordering_fields = ['followers_count', 'posts_count', 'created_at']
     ordering = ['-followers_count']
     
+    def get_queryset(self):
+        return TopicSerializer.prefetch_queryset(super().get_queryset()).annotate(
+            followed_by_me=Exists(TopicFollowing.objects.filter(
+                topic=OuterRef('pk'), user_id=self.request.user.id
+            ))
+        )
+    
     def perform_create(self, serializer):
         """Set creator when creating topic"""
         serializer.save(creator=self.request.user)
     
     def perform_destroy(self, instance):
         """Only creator can delete"""
-        from rest_framework.exceptions import PermissionDenied
         if instance.creator != self.request.user:
             raise PermissionDenied('Cannot delete topic you did not create')
         instance.delete()
@@ -226,8 +250,7 @@ class TopicViewSet(viewsets.ModelViewSet):
         )
         
         if created:
-            topic.followers_count += 1
-            topic.save(update_fields=['followers_count'])
+            topic.bump('followers_count')
             return Response({'detail': 'Following topic'}, status=status.HTTP_201_CREATED)
         else:
             return Response({'detail': 'Already following'}, status=status.HTTP_400_BAD_REQUEST)
@@ -239,8 +262,7 @@ class TopicViewSet(viewsets.ModelViewSet):
         try:
             following = TopicFollowing.objects.get(user=request.user, topic=topic)
             following.delete()
-            topic.followers_count = max(0, topic.followers_count - 1)
-            topic.save(update_fields=['followers_count'])
+            topic.bump('followers_count', -1)
             return Response({'detail': 'Unfollowed topic'})
         except TopicFollowing.DoesNotExist:
             return Response({'detail': 'Not following'}, status=status.HTTP_400_BAD_REQUEST)
@@ -248,9 +270,7 @@ class TopicViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def my_topics(self, request):
         """Get topics user is following"""
-        topics = Topic.objects.filter(
-            topicfollowing__user=request.user
-        ).distinct()
+        topics = self.filter_queryset(self.get_queryset()).filter(followers__user=request.user)
         page = self.paginate_queryset(topics)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -276,7 +296,11 @@ class PostViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter by topic if provided"""
-        queryset = super().get_queryset()
+        queryset = PostSerializer.prefetch_queryset(super().get_queryset()).annotate(
+            liked_by_me=Exists(Like.objects.filter(
+                post=OuterRef('pk'), user_id=self.request.user.id
+            ))
+        )
         topic_id = self.request.query_params.get('topic_id')
         if topic_id:
             queryset = queryset.filter(topic_id=topic_id)
@@ -288,10 +312,25 @@ class PostViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Only creator can delete"""
-        from rest_framework.exceptions import PermissionDenied
         if instance.creator != self.request.user:
             raise PermissionDenied('Cannot delete topic you did not create')
         instance.delete()
+    
+    @action(detail=False, methods=['get'])
+    def fast_list(self, request):
+        """Lightweight feed rows built from values(), without model instances or serializers"""
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(
+            'id', 'title', 'likes_count', 'comments_count', 'created_at',
+            creator_username=F('creator__username'),
+            creator_profile_picture=F('creator__profile__profile_picture'),
+            is_liked=F('liked_by_me'),
+        )
+        page = self.paginate_queryset(queryset)
+        rows = list(page if page is not None else queryset)
+        
+        if page is not None:
+            return self.get_paginated_response(rows)
+        return Response(rows)
         
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -303,6 +342,24 @@ class PostViewSet(viewsets.ModelViewSet):
 # COMMENT VIEWSETS
 # ============================================================================
 
+def attach_replies(comments):
+    """Load every comment of the given comments' posts in one query and attach
+    each node's direct replies as `_prefetched_replies`"""
+    comments = list(comments)
+    posts = {comment.post_id: comment.post for comment in comments}
+    thread = NestedUserProfileSerializer.join_profiles(
+        Comment.objects.filter(post_id__in=posts), 'creator'
+    ).order_by('parent_comment_id', 'created_at')
+    
+    children = defaultdict(list)
+    for comment in thread:
+        comment.post = posts[comment.post_id]  # Replies render the same, already loaded post
+        children[comment.parent_comment_id].append(comment)
+    for comment in [*thread, *comments]:
+        comment._prefetched_replies = children[comment.id]
+    return comments
+
+
 class CommentViewSet(viewsets.ModelViewSet):
     """Comments on posts"""
     queryset = Comment.objects.filter(is_hidden=False)
@@ -312,21 +369,58 @@ class CommentViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter by post if provided"""
-        queryset = super().get_queryset()
+        queryset = CommentSerializer.prefetch_queryset(super().get_queryset()).annotate(
+            post_liked_by_me=Exists(Like.objects.filter(
+                post=OuterRef('post_id'), user_id=self.request.user.id
+            ))
+        )
         post_id = self.request.query_params.get('post_id')
         if post_id:
             queryset = queryset.filter(post_id=post_id)
         return queryset
     
+    def prepare_comments(self, comments):
+        for comment in comments:
+            # Read by PostSerializer.get_is_liked on the nested post
+            comment.post.liked_by_me = comment.post_liked_by_me
+        return attach_replies(comments)
+    
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None:
+            self.prepare_comments(page)
+        return page
+    
+    def retrieve(self, request, *args, **kwargs):
+        comment = self.get_object()
+        self.prepare_comments([comment])
+        serializer = self.get_serializer(comment)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def thread(self, request):
+        """Get a post's whole comment thread as a flat, path-ordered list"""
+        post_id = request.query_params.get('post_id')
+        if not post_id:
+            return Response({'detail': 'post_id required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            post_id = int(post_id)  # Goes into raw SQL, where a bad value is a DataError
+        except ValueError:
+            return Response({'detail': 'post_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        comments = Comment.get_thread(post_id)
+        prefetch_related_objects(comments, 'creator__profile__reputation_tier')
+        serializer = CommentThreadSerializer(comments, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
+    
     def perform_create(self, serializer):
         """Set creator when creating comment"""
         serializer.save(creator=self.request.user)
     
     def perform_update(self, serializer):
         """Track edit history"""
-        from rest_framework.exceptions import PermissionDenied
-        instance = self.get_object()
-        if instance.creator != self.request.user:
+        instance = serializer.instance  # Already fetched by update()
+        if instance.creator_id != self.request.user.id:
             raise PermissionDenied('Cannot edit comment you did not create')
         
         # Track edit
@@ -339,43 +433,49 @@ class CommentViewSet(viewsets.ModelViewSet):
             serializer.save(is_edited=True, edit_history=edit_history)
         else:
             serializer.save()
+        self.prepare_comments([instance])
     
     def perform_destroy(self, instance):
         """Only creator can delete"""
-        from rest_framework.exceptions import PermissionDenied
         if instance.creator != self.request.user:
             raise PermissionDenied('Cannot delete topic you did not create')
         instance.delete()
     
+    def get_counter_target(self, pk):
+        """Just what the like actions and the like signals read, without the
+        serializer joins of get_queryset; the counter itself moves via bump()"""
+        return get_object_or_404(self.queryset.only('id', 'creator_id'), pk=pk)
+    
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
         """Like a comment"""
-        comment = self.get_object()
-        like, created = Like.objects.get_or_create(
-            user=request.user,
-            content_type='comment',
-            comment=comment
-        )
+        comment = self.get_counter_target(pk)
         
-        if created:
-            comment.likes_count += 1
-            comment.save(update_fields=['likes_count'])
-            return Response({'detail': 'Liked'}, status=status.HTTP_201_CREATED)
-        else:
+        # Insert and let the unique constraint report an existing like
+        try:
+            with transaction.atomic():
+                Like.objects.create(user=request.user, comment=comment)
+                comment.bump('likes_count')
+        except IntegrityError:
             return Response({'detail': 'Already liked'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'detail': 'Liked'}, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def unlike(self, request, pk=None):
         """Unlike a comment"""
-        comment = self.get_object()
-        try:
-            like = Like.objects.get(user=request.user, content_type='comment', comment=comment)
+        # One query for the like and the slice of its comment the like signals read.
+        # Locking the like makes a concurrent unlike wait and then find nothing,
+        # instead of both requests deleting it and reversing its reputation twice
+        with transaction.atomic():
+            try:
+                like = Like.objects.select_for_update(of=('self',)).select_related('comment').only(
+                    'user_id', 'comment_id', 'post_id', 'reputation_value', 'comment__creator_id'
+                ).get(user=request.user, comment_id=pk, comment__is_hidden=False)
+            except Like.DoesNotExist:
+                return Response({'detail': 'Not liked'}, status=status.HTTP_400_BAD_REQUEST)
             like.delete()
-            comment.likes_count = max(0, comment.likes_count - 1)
-            comment.save(update_fields=['likes_count'])
-            return Response({'detail': 'Unliked'})
-        except Like.DoesNotExist:
-            return Response({'detail': 'Not liked'}, status=status.HTTP_400_BAD_REQUEST)
+            like.comment.bump('likes_count', -1)
+        return Response({'detail': 'Unliked'})
 
 
 # ============================================================================
@@ -388,13 +488,20 @@ class ReactionViewSet(viewsets.ModelViewSet):
     serializer_class = ReactionSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_queryset(self):
+        return ReactionSerializer.prefetch_queryset(super().get_queryset())
+    
     def perform_create(self, serializer):
         """Set user when creating reaction"""
-        serializer.save(user=self.request.user)
+        # Insert and let the unique constraints report a repeated reaction
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            raise ValidationError({'detail': 'Already reacted'})
     
     def perform_destroy(self, instance):
         """Only creator can delete"""
-        from rest_framework.exceptions import PermissionDenied
         if instance.creator != self.request.user:
             raise PermissionDenied('Cannot delete topic you did not create')
         instance.delete()
@@ -404,60 +511,87 @@ class ReactionViewSet(viewsets.ModelViewSet):
 # POLL VIEWSETS
 # ============================================================================
 
+def voter_summary(request):
+    """The requester as NestedUserProfileSerializer shows them, from one joined query;
+    None for a user without a profile, as the nested serializers render them"""
+    profile = UserProfile.objects.select_related('user', 'reputation_tier').filter(user=request.user).first()
+    if profile is None:
+        return None
+    return NestedUserProfileSerializer(profile, context={'request': request}).data
+
+
 class PollViewSet(viewsets.ModelViewSet):
     """Polls on posts"""
     queryset = Poll.objects.all()
     serializer_class = PollSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        return PollSerializer.prefetch_queryset(super().get_queryset())
+    
     @action(detail=True, methods=['post'])
     def vote(self, request, pk=None):
         """Vote on a poll"""
-        poll = self.get_object()
+        # Not get_object(): the options prefetch and creator joins are for rendering
+        poll = get_object_or_404(self.queryset.only('id', 'allow_vote_change'), pk=pk)
         option_id = request.data.get('option_id')
         
         if not option_id:
             return Response({'detail': 'option_id required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        option = get_object_or_404(PollOption, id=option_id, poll=poll)
+        if not PollOption.objects.filter(id=option_id, poll=poll).exists():
+            raise Http404('No PollOption matches the given query.')
         
-        # Check if user already voted
-        existing_vote = PollVote.objects.filter(user=request.user, poll=poll).first()
-        
-        if existing_vote and not poll.allow_vote_change:
-            return Response(
-                {'detail': 'Cannot change vote on this poll'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        if existing_vote:
-            existing_vote.option = option
-            existing_vote.save()
+        # Either move an existing vote in one UPDATE or find out there is none
+        existing_votes = PollVote.objects.filter(user=request.user, poll=poll)
+        if not poll.allow_vote_change:
+            if existing_votes.exists():
+                return Response(
+                    {'detail': 'Cannot change vote on this poll'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        elif existing_votes.update(option_id=option_id):
             return Response({'detail': 'Vote updated'})
         
-        vote = PollVote.objects.create(user=request.user, poll=poll, option=option)
-        serializer = PollVoteSerializer(vote)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        try:
+            with transaction.atomic():
+                vote = PollVote.objects.create(user=request.user, poll=poll, option_id=option_id)
+        except IntegrityError:
+            # A concurrent request from the same user got its first vote in first
+            return Response({'detail': 'Already voted'}, status=status.HTTP_409_CONFLICT)
+        
+        # PollVoteSerializer's shape, without building a ModelSerializer for one row
+        return Response({
+            'id': vote.id,
+            'user': voter_summary(request),
+            'poll': poll.id,
+            'option': vote.option_id,
+            'created_at': DateTimeField().to_representation(vote.created_at),
+        }, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def end(self, request, pk=None):
         """End a poll (creator only)"""
-        poll = self.get_object()
-        if poll.creator.user != request.user:
+        # The common case is a single UPDATE; the poll is only read to explain a refusal
+        if self.queryset.filter(
+            pk=pk, creator=request.user, can_end_manually=True, ended_at__isnull=True
+        ).update(ended_at=timezone.now()):
+            return Response({'detail': 'Poll ended'})
+        
+        poll = get_object_or_404(self.queryset.only('creator_id', 'can_end_manually', 'ended_at'), pk=pk)
+        if poll.creator_id != request.user.id:
             return Response(
                 {'detail': 'Only creator can end poll'},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if not poll.can_end_manually:
-            return Response(
-                {'detail': 'This poll cannot be ended manually'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        if poll.ended_at is not None:
+            return Response({'detail': 'Poll already ended'}, status=status.HTTP_400_BAD_REQUEST)
         
-        poll.ended_at = timezone.now()
-        poll.save(update_fields=['ended_at'])
-        return Response({'detail': 'Poll ended'})
+        return Response(
+            {'detail': 'This poll cannot be ended manually'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
 
 # ============================================================================
@@ -473,7 +607,7 @@ class FactCheckNoteViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter by post/comment"""
-        queryset = super().get_queryset()
+        queryset = FactCheckNoteSerializer.prefetch_queryset(super().get_queryset())
         post_id = self.request.query_params.get('post_id')
         comment_id = self.request.query_params.get('comment_id')
         
@@ -484,10 +618,32 @@ class FactCheckNoteViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """Notes are read far more than written; serve each page from the cache
+        for up to 30 seconds, until a note or vote changes"""
+        params = request.query_params
+        key = ':'.join([
+            FACT_CHECK_LIST_VERSION_KEY, str(cache.get(FACT_CHECK_LIST_VERSION_KEY, 0)),
+            *(params.get(name, '') for name in ('post_id', 'comment_id', 'page', 'page_size')),
+        ])
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, 30)
+        return Response(data)
+    
+    def get_user_tier(self):
+        """The requester's tier, fetched once per request in a single query"""
+        request = self.request
+        if not hasattr(request, '_user_tier'):
+            request._user_tier = ReputationTier.objects.only(
+                'tier_number', 'reputation_multiplier'
+            ).get(userprofile__user=request.user)
+        return request._user_tier
+    
     def perform_create(self, serializer):
         """Check tier before creating"""
-        from rest_framework.exceptions import PermissionDenied
-        user_tier = self.request.user.profile.reputation_tier.tier_number   # type: ignore[attr-defined]
+        user_tier = self.get_user_tier().tier_number
         if user_tier < 3:  # Only Tier 3+ can create
             raise PermissionDenied(f'Need Tier 3+ to add fact-check notes (you are Tier {user_tier})')
         serializer.save(creator=self.request.user)
@@ -495,29 +651,32 @@ class FactCheckNoteViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def vote(self, request, pk=None):
         """Vote on note usefulness"""
-        note = self.get_object()
+        # Not get_object(): the vote only needs the note's id, not the joins and helpful_ratio
+        note = get_object_or_404(self.queryset.only('id'), pk=pk)
         vote_type = request.data.get('vote_type')  # 'helpful' or 'unhelpful'
         
         if vote_type not in ['helpful', 'unhelpful']:
             return Response({'detail': 'Invalid vote_type'}, status=status.HTTP_400_BAD_REQUEST)
         
         # Get vote weight based on user tier
-        user_tier = request.user.profile.reputation_tier
+        user_tier = self.get_user_tier()
         vote_weight = float(user_tier.reputation_multiplier)
         
-        vote, created = FactCheckVote.objects.get_or_create(
+        vote, created = FactCheckVote.objects.update_or_create(
             user=request.user,
             note=note,
             defaults={'vote_type': vote_type, 'vote_weight': vote_weight}
         )
         
-        if not created:
-            vote.vote_type = vote_type
-            vote.vote_weight = vote_weight
-            vote.save()
-        
-        serializer = FactCheckVoteSerializer(vote)
-        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+        # FactCheckVoteSerializer's shape, without building a ModelSerializer for one row
+        return Response({
+            'id': vote.id,
+            'user': voter_summary(request),
+            'note': note.id,
+            'vote_type': vote.vote_type,
+            'vote_weight': vote.vote_weight,
+            'created_at': DateTimeField().to_representation(vote.created_at),
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
 
 # ============================================================================
@@ -533,11 +692,11 @@ class FlagViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self) -> "QuerySet[Flag]":     # type: ignore[override]
         """Users can only see their own flags unless they're moderators"""
-        from django.db.models import QuerySet
         user = self.request.user
+        queryset = FlagSerializer.prefetch_queryset(Flag.objects.all())
         if user.is_staff:
-            return Flag.objects.all()
-        return Flag.objects.filter(Q(identified_flagger=user) | Q(flagger=user))
+            return queryset
+        return queryset.filter(Q(identified_flagger=user) | Q(flagger=user))
 
     def perform_create(self, serializer):
         """Create a flag, optionally identifying the flagger"""
@@ -546,3 +705,35 @@ class FlagViewSet(viewsets.ModelViewSet):
             serializer.save(flagger=None)
         else:
             serializer.save(flagger=self.request.user, identified_flagger=self.request.user)
+    
+    @action(detail=False, methods=['post'])
+    def bulk_review(self, request):
+        """Review many flags at once from a list of {id, status, review_notes}"""
+        if not request.user.is_staff:
+            raise PermissionDenied('Only moderators can review flags')
+        
+        serializer = FlagReviewSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        reviews = serializer.validated_data
+        
+        with transaction.atomic():
+            flags = Flag.objects.select_for_update().in_bulk(
+                [review['id'] for review in reviews]
+            )
+            reviewed_at = timezone.now()
+            for review in reviews:
+                flag = flags.get(review['id'])
+                if flag is None:
+                    continue
+                flag.status = review['status']
+                flag.review_notes = review.get('review_notes', flag.review_notes)
+                flag.reviewed_by = request.user
+                flag.reviewed_at = reviewed_at
+            Flag.objects.bulk_update(
+                flags.values(),
+                ['status', 'review_notes', 'reviewed_by', 'reviewed_at'],
+                batch_size=500
+            )
+        
+        return Response({'updated': len(flags)})